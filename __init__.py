@@ -1,8 +1,21 @@
 from .fee import TransactionCost
+from .execution import ExecutionRules
 from .timeframe import TimeFrame
 from .optimizer import Optimizer
 from .backtest_engine import BacktestEngine
+from .portfolio import PortfolioBacktest
+from .ensemble import EnsembleBacktest
+from .profiling import Profiler
+from .report import render_reports
+from .result_store import ResultStore
+from .search import RandomSearch, SuccessiveHalving, BayesianSearch
+from .bootstrap import bootstrap_metrics, deflated_sharpe
+from .rolling_metrics import rolling_metrics_frame
 
 from .fetch_price_data import fetch_price, concat_price
-from .in_out_sample import split_and_backtest
-from .models import ma_pct_diff, ma_crossover, z_score, min_max_scaler, precentile_rank, robust_scaling, rsi
\ No newline at end of file
+from .kline_store import convert_klines, convert_all_klines, read_klines
+from .partitions import load_partitions, iter_partitions
+from .in_out_sample import split_and_backtest, walk_forward, walk_forward_splits, purged_kfold_splits
+from .models import ma_pct_diff, ma_crossover, z_score, min_max_scaler, precentile_rank, robust_scaling, rsi
+from .indicator_cache import enable_indicator_cache, disable_indicator_cache, clear_indicator_cache, indicator_cache_info
+from .result_cache import enable_result_cache, disable_result_cache, clear_result_cache, result_cache_info
\ No newline at end of file
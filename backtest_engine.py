@@ -1,9 +1,14 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from typing import Callable
 
+from . import plotting, result_cache, vectorized
+from .execution import ExecutionRules, execute
 from .fee import TransactionCost
+from .metrics import RunningMetrics, compute_metrics
+from .profiling import Profiler, profile_stage
+from .result_cache import ENGINE_ARRAYS
+from .rolling_metrics import DEFAULT_DAYS, ROLLING_METRICS, rolling_metrics_frame
 from .timeframe import TimeFrame
 
 
@@ -19,6 +24,11 @@ class BacktestEngine:
         self.strategy_function = strategy_function
         self.transaction_cost = transaction_cost
         self.stratergy_params = stratergy_params
+        self.metrics = None  # BacktestMetrics, set by run()
+        self._running_metrics = None  # RunningMetrics, built on the first append()
+        self.profiler: Profiler | None = None  # records the stages of run()
+        self.execution: ExecutionRules | None = None  # stops, take-profits and sizing applied by run()
+        self.use_cache = True  # read and write the result cache when it is enabled; off when an Optimizer caches the run
         
         self.timeframe_str = self._get_timeframe()  # 'M15'
         self.annualized_factor = self._get_annualized_factor()  # 365 * 24 * 4
@@ -27,13 +37,8 @@ class BacktestEngine:
         self.params_str = self._format_strategy_params(self.stratergy_params)  # 'ma=10 | diff=1'
     
     def _get_timeframe(self) -> str:
-        time_delta = self.data.index[1] - self.data.index[0]
-        
-        for timeframe in TimeFrame:
-            if time_delta == timeframe.value.time_delta:
-                return timeframe.name
-        
-        raise ValueError(f'Unsupported timeframe: {time_delta}')
+        # Inferred from the median index spacing; the timeframe recorded by fetch_price is the fallback
+        return TimeFrame.from_data(self.data).name
     
     def _get_annualized_factor(self) -> int:
         timeframe_str = self.timeframe_str
@@ -60,15 +65,115 @@ class BacktestEngine:
         return price_df[(price_df.index >= alpha_start_date) & (price_df.index <= alpha_end_date)]
         
     def run(self) -> None:
-        self.data['price_ret'] = self.data['close'].pct_change()
-        self.data['signal'] = self.strategy_function(self.alpha, **self.stratergy_params)
-        self.data['positions'] = self.data['signal'].shift(1).fillna(0)
-        self.data['transaction_cost'] = self.data['positions'].diff().abs() * self.transaction_cost
-        self.data['pnl'] = self.data['price_ret'] * self.data['positions'] - self.data['transaction_cost']
-        self.data['cum_pnl'] = self.data['pnl'].cumsum()
-        self.data['drawdown'] = self.data['cum_pnl'] - self.data['cum_pnl'].cummax()
+        profiler = self.profiler
+        cache = result_cache.active_cache() if self.use_cache else None
+        if cache is not None:
+            key = self._cache_key()
+            entry = cache.get(key, ENGINE_ARRAYS + (() if self.execution is None else ('exit',)), engine=True)
+            if entry is not None:
+                self._restore(entry)
+                return
+        
+        with profile_stage(profiler, 'signal', **self.stratergy_params):
+            signal = self.strategy_function(self.alpha, **self.stratergy_params)
+        
+        with profile_stage(profiler, 'pnl', **self.stratergy_params):
+            self.data['price_ret'] = vectorized.price_returns(self.data['close'].to_numpy(dtype=float))
+            self.data['signal'] = signal
+            if self.execution is None:
+                result = vectorized.backtest_signals(self.data['price_ret'].to_numpy(), self.data['signal'].to_numpy(dtype=float), self.transaction_cost)
+            else:
+                result = execute(self.data, self.data['signal'].to_numpy(dtype=float), self.execution, self.transaction_cost, self.annualized_factor)
+                self.data['exit'] = result['exit']
+            for column in ['positions', 'transaction_cost', 'pnl', 'cum_pnl', 'drawdown']:
+                self.data[column] = result[column]
+        
+        # All statistics are computed once here; the properties below only read them
+        with profile_stage(profiler, 'metrics', **self.stratergy_params):
+            self._running_metrics = None
+            self.metrics = compute_metrics(self.data.index, result['positions'], result['pnl'], result['cum_pnl'],
+                                           result['drawdown'], self.annualized_factor)
+        
+        if cache is not None:
+            arrays = {column: self.data[column].to_numpy() for column in ENGINE_ARRAYS}
+            if self.execution is not None:
+                arrays['exit'] = result['exit']
+            cache.put(key, self.metrics.sharpe, self.metrics.calmar, self.metrics, arrays)
+    
+    def _cache_key(self) -> str:
+        base = result_cache.base_key(self.data, self.strategy_function, self.alpha, self.transaction_cost,
+                                     self.annualized_factor, self.execution)
+        return result_cache.result_key(base, self.stratergy_params)
+    
+    def _restore(self, entry: dict) -> None:
+        """Fill the result columns and metrics from a cached run."""
+        self.data['price_ret'] = vectorized.price_returns(self.data['close'].to_numpy(dtype=float))
+        arrays = entry['arrays']
+        self.data['signal'] = arrays['signal']
+        if 'exit' in arrays:
+            self.data['exit'] = arrays['exit']
+        for column in ENGINE_ARRAYS[1:]:
+            self.data[column] = arrays[column]
+        self.data['drawdown'] = vectorized.drawdown(entry['arrays']['cum_pnl'])
+        self._running_metrics = None
+        self.metrics = entry['metrics']
+    
+    def append(self, bars: pd.DataFrame, alpha_rows: pd.DataFrame | pd.Series | None = None) -> None:
+        """Extend a finished run with new bars, computing results and metrics only for the new rows.
+        
+        `alpha_rows` defaults to `bars`. A strategy function with a `lookback` attribute (an int, or a
+        callable taking the strategy params) is evaluated on that many trailing alpha rows plus the
+        new ones instead of the full history. With execution rules, whose state depends on the whole
+        path, the extended history is run again in full.
+        """
+        if self.metrics is None:
+            raise RuntimeError('Call run() before append().')
+        if self.execution is not None:
+            self.data = pd.concat([self.data, bars])
+            self.alpha = pd.concat([self.alpha, bars if alpha_rows is None else alpha_rows])
+            self.run()
+            return
+        if self._running_metrics is None:
+            self._running_metrics = RunningMetrics(self.annualized_factor)
+            self._running_metrics.update(self.data.index, self.data['positions'].to_numpy(), self.data['pnl'].to_numpy())
+        
+        new_data = bars.copy()
+        self.alpha = pd.concat([self.alpha, bars if alpha_rows is None else alpha_rows])
+        
+        # Prefix the last two known bars so returns, positions and costs continue across the boundary
+        close = np.concatenate([self._tail_values('close'), new_data['close'].to_numpy(dtype=float)])
+        signal = np.concatenate([self._tail_values('signal'), self._tail_signal(new_data.index)])
+        price_ret = vectorized.price_returns(close)
+        result = vectorized.backtest_signals(price_ret, signal, self.transaction_cost)
+        
+        new_data['price_ret'] = price_ret[2:]
+        for column in ['signal', 'positions', 'transaction_cost', 'pnl']:
+            new_data[column] = result[column][2:]
+        new_data['cum_pnl'], new_data['drawdown'] = self._running_metrics.update(
+            new_data.index, new_data['positions'].to_numpy(), new_data['pnl'].to_numpy())
+        
+        self.data = pd.concat([self.data, new_data])
+        self.metrics = self._running_metrics.snapshot()
+    
+    def _tail_values(self, column: str, n: int = 2) -> np.ndarray:
+        values = self.data[column].to_numpy(dtype=float)[-n:]
+        return np.concatenate([np.full(n - len(values), np.nan), values])
+    
+    def _tail_signal(self, index: pd.Index) -> np.ndarray:
+        """Evaluate the strategy on the trailing alpha window and return the signal of the new rows."""
+        lookback = getattr(self.strategy_function, 'lookback', None)
+        if callable(lookback):
+            lookback = lookback(**self.stratergy_params)
+        alpha = self.alpha if lookback is None else self.alpha.iloc[-(int(lookback) + len(index)):]
+        
+        signal = self.strategy_function(alpha, **self.stratergy_params)
+        if isinstance(signal, (pd.Series, pd.DataFrame)):
+            return vectorized.align_signal(signal, index)
+        return np.asarray(signal, dtype=float)[-len(index):]
     
     def run_with_params(self, **stratergy_params) -> None:
+        # Invalidate the metrics of the previous run
+        self.metrics = None
         # Update the strategy parameters
         if stratergy_params:
             self.stratergy_params = stratergy_params
@@ -78,166 +183,90 @@ class BacktestEngine:
     
     @property
     def annual_return(self) -> float:
-        """Calculate and cache the annualized return."""
-        return self.data['pnl'].mean() * self.annualized_factor
+        """Get the annualized return."""
+        return self.metrics.annual_return
     
     @property
     def max_drawdown(self) -> float:
-        """Calculate and cache the maximum drawdown."""
-        return self.data['drawdown'].min()
+        """Get the maximum drawdown."""
+        return self.metrics.max_drawdown
     
     @property
     def sharpe(self) -> float:
-        """Calculate and cache the Sharpe ratio."""
-        if self.data['pnl'].std() == 0:
-            return np.nan
-        return self.data['pnl'].mean() / self.data['pnl'].std() * np.sqrt(self.annualized_factor)
+        """Get the Sharpe ratio."""
+        return self.metrics.sharpe
     
     @property
     def calmar(self) -> float:
-        """Calculate and cache the Calmar ratio."""
-        if self.max_drawdown == 0.0:
-            return np.nan
-        return self.annual_return / abs(self.max_drawdown)
+        """Get the Calmar ratio."""
+        return self.metrics.calmar
     
     @property
     def exposure(self) -> float:
-        """Calculate the exposure."""
-        return self.data['positions'].abs().mean()
+        """Get the exposure."""
+        return self.metrics.exposure
     
     @property
     def long_short_ratio(self) -> float | str:
-        """Calculate the long and short ratio."""
-        long_period = self.data['positions'][self.data['positions'] > 0].count()
-        short_period = self.data['positions'][self.data['positions'] < 0].count()
-        
-        if short_period == 0:
-            return 'Long Only'
-        elif long_period == 0:
-            return 'Short Only'
-        
-        return round(long_period / short_period, 2)
+        """Get the long and short ratio."""
+        return self.metrics.long_short_ratio
     
     @property
     def no_of_trades(self) -> int:
-        """Calculate the number of trades."""
-        return int(self.data['positions'].fillna(0).diff().abs().sum() // 2)
+        """Get the number of trades."""
+        return self.metrics.no_of_trades
     
     @property
     def dd_duration(self) -> float:
-        """Calculate the duration of the maximum drawdown."""
-        mdd_date = self.data['drawdown'].idxmin()
-        mdd_start_date = self.data['cum_pnl'][:mdd_date].idxmax()
-    
-        post_mdd_data = self.data['cum_pnl'][mdd_date:]
-        new_high_data = post_mdd_data[post_mdd_data > self.data['cum_pnl'][mdd_start_date]]
+        """Get the duration of the maximum drawdown in days."""
+        return self.metrics.dd_duration
     
-        if new_high_data.empty:
-            new_high_date = self.data.index[-1]
-        else:
-            new_high_date = new_high_data.index[0]
-        
-        return (new_high_date - mdd_start_date).days
+    def rolling_metrics(self, days: tuple[int, ...] = DEFAULT_DAYS, names: tuple[str, ...] = ROLLING_METRICS) -> pd.DataFrame:
+        """Calculate rolling Sharpe, return, volatility, max drawdown and Calmar over windows in days, in one pass."""
+        return rolling_metrics_frame(self.data['pnl'], days, self.annualized_factor, names)
     
-    def _get_rolling_sharpe(self, days=60) -> pd.Series:
-        """Calculate the rolling Sharpe ratio."""
-        if self.data['pnl'].std() == 0:
-            return np.nan
+    def stats_text(self) -> str:
+        """Format all key statistics as a text block."""
+        align = 20  # Set the alignment width as a variable
         
-        window = int(days * self.annualized_factor / 365)
-        return self.data['pnl'].rolling(window=window).mean() / self.data['pnl'].rolling(window=window).std() * np.sqrt(self.annualized_factor)
+        return '\n'.join([
+            f'{self.strategy_name} | {self.params_str}',
+            f'-' * 42,
+            f'Sharpe                {self.sharpe:>{align}.2f}',
+            f'Calmar                {self.calmar:>{align}.2f}',
+            f'-' * 42,
+            f'Exposure              {self.exposure:>{align}.2f}',
+            f'No of Trades          {self.no_of_trades:>{align}}',
+            f'No of Data Points     {len(self.data):>{align}}',
+            f'Start Date            {str(self.data.index[0]):>{align}}',
+            f'End Date              {str(self.data.index[-1]):>{align}}',
+            f'-' * 42,
+            f'Annu Ret [%]          {self.annual_return * 100:>{align}.2f}',
+            f'Max DD [%]            {self.max_drawdown * 100:>{align}.2f}',
+            f'Max DD Dur [days]     {self.dd_duration:>{align}}',
+            f'Long/Short Ratio      {self.long_short_ratio:>{align}}',
+        ])
     
     def stats(self):
         """Display all key statistics."""
-        align = 20  # Set the alignment width as a variable
-
-        print(f'{self.strategy_name} | {self.params_str}')
-        print(f'-' * 42)
-        print(f'Sharpe                {self.sharpe:>{align}.2f}')
-        print(f'Calmar                {self.calmar:>{align}.2f}')
-        print(f'-' * 42)
-        print(f'Exposure              {self.exposure:>{align}.2f}')
-        print(f'No of Trades          {self.no_of_trades:>{align}}')
-        print(f'No of Data Points     {len(self.data):>{align}}')
-        print(f'Start Date            {str(self.data.index[0]):>{align}}')
-        print(f'End Date              {str(self.data.index[-1]):>{align}}')
-        print(f'-' * 42)
-        print(f'Annu Ret [%]          {self.annual_return * 100:>{align}.2f}')
-        print(f'Max DD [%]            {self.max_drawdown * 100:>{align}.2f}')
-        print(f'Max DD Dur [days]     {self.dd_duration:>{align}}')
-        print(f'Long/Short Ratio      {self.long_short_ratio:>{align}}')
+        print(self.stats_text())
     
     def report(self):
         self.stats()
         self.plot_pnl()
     
-    def plot_pnl(self, slice_range: tuple[int, int] = None, benchmark: bool = False):
-        start, end = slice_range if slice_range else (None, None)
-        pnl = self.data['pnl'].iloc[start:end]
-        cum_pnl = pnl.cumsum()
-        label = f'{self.params_str} | sr:{self.sharpe:.2f} | cr:{self.calmar:.2f}'
-        
-        if benchmark:
-            plt.plot(self.data['price_ret'].cumsum(), lw=1, zorder=0, color='grey', label='Buy and Hold')
-            plt.legend()
-        
-        plt.plot(cum_pnl, label=label, lw=1.5)
-        plt.title(self.strategy_name)
-        plt.legend()
-        plt.grid(alpha=0.3)
-        plt.xticks(rotation=30)
-        plt.tight_layout()
-        plt.show()
-    
-    def plot_dd(self):
-        plt.plot(self.data['drawdown'])
-        plt.title('Drawdown')
-        plt.grid(alpha=0.3)
-        plt.xticks(rotation=30)
-        plt.show()
-    
-    def plot_positions(self):
-        plt.plot(self.data['positions'])
-        plt.title('Positions')
-        plt.grid(alpha=0.3)
-        plt.xticks(rotation=30)
-        plt.show()
-    
-    def plot_rolling_sharpe(self, days=60, ma=60, sharpe=2):
-        rolling_sharpe = self._get_rolling_sharpe(days).dropna()
-        rolling_sharpe_ma = rolling_sharpe.rolling(window=ma).mean()
-        # plt.figure(figsize=(12, 3))
-        plt.plot(rolling_sharpe)
-        plt.plot(rolling_sharpe_ma, label=f'{ma}-MA')
-        plt.hlines(sharpe, self.data.index[0], self.data.index[-1],colors='red', linestyles='dashed')
-        plt.title(f'Rolling Sharpe ({days}-Days)')
-        plt.legend()
-        plt.grid(alpha=0.3)
-        plt.xticks(rotation=30)
-        plt.show()
-    
-    def plot(self):
-        # create subplot of pnl, drawdown, rolling sharpes
-        gridspec_kw = {'height_ratios': [4, 1, 1]}
-        fig, ax = plt.subplots(3, 1, figsize=(12, 12), sharex=True, gridspec_kw=gridspec_kw)
-        
-        # set the figure size
-        
-        label = f'{self.params_str} | sr:{self.sharpe:.2f} | cr:{self.calmar:.2f}'
-        
-        ax[0].plot(self.data['cum_pnl'], label=label, lw=1.5)
-        ax[0].set_title(f'{self.strategy_name} PnL')
-        ax[0].grid(alpha=0.3)
-        
-        # Plot Drawdown
-        ax[1].plot(self.data['drawdown'], lw=1.5)
-        ax[1].set_title('Drawdown')
-        ax[1].grid(alpha=0.3)
-        
-        # Plot Rolling Sharpe
-        ax[2].plot(self.metrics.get_rolling_sharpe(), lw=1.5)
-        ax[2].set_title('Rolling Sharpe')
-        ax[2].grid(alpha=0.3)
-        
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+    # Plotting lives in plotting.py, which imports matplotlib only when a plot is drawn
+    def plot_pnl(self, slice_range: tuple[int, int] = None, benchmark: bool = False, show: bool = True):
+        return plotting.plot_pnl(self, slice_range, benchmark, show)
+    
+    def plot_dd(self, show: bool = True):
+        return plotting.plot_dd(self, show)
+    
+    def plot_positions(self, show: bool = True):
+        return plotting.plot_positions(self, show)
+    
+    def plot_rolling_sharpe(self, days=60, ma=60, sharpe=2, show: bool = True):
+        return plotting.plot_rolling_sharpe(self, days, ma, sharpe, show)
+    
+    def plot(self, show: bool = True):
+        return plotting.plot(self, show)
\ No newline at end of file
@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+
+from . import models, result_cache
+from .backtest_engine import BacktestEngine
+from .fetch_price_data import fetch_price
+from .kline_store import convert_klines, read_klines
+from .optimizer import Optimizer
+from .timeframe import TimeFrame
+
+KLINES_DIR = os.path.join(os.path.dirname(__file__), 'price_data', 'klines')
+
+# name -> [(interval, years)] of synthetic data sizes
+SIZES = {
+    'quick': [('1d', 5), ('4h', 5)],
+    'full': [('1d', 5), ('4h', 5), ('1h', 5), ('1m', 3)],
+}
+GRIDS = {
+    'quick': [(5, 5), (10, 10)],
+    'full': [(5, 5), (10, 10), (20, 20)],
+}
+
+
+def double_rsi_momentum(df: pd.DataFrame, rsi_short: int = 14, rsi_long: int = 25) -> pd.Series:
+    """The README strategy, defined here so worker processes can import it."""
+    spread = models.rsi(df['close'], rsi_long) - models.rsi(df['close'], rsi_short)
+    return pd.Series(np.where(spread < -5, 1, 0), index=df.index)
+
+def readme_double_rsi_momentum(df: pd.DataFrame, rsi_short: int = 14, rsi_long: int = 25) -> pd.Series:
+    """The README strategy as written there, adding its indicator and signal columns to `df`."""
+    df['rsi_short'] = models.rsi(df['close'], rsi_short)
+    df['rsi_long'] = models.rsi(df['close'], rsi_long)
+    df['spread'] = df['rsi_long'] - df['rsi_short']
+    df['signal'] = np.where(df['spread'] < -5, 1, 0)
+    return df['signal']
+
+def synthetic_klines(interval: str = '4h', years: float = 5, seed: int = 0) -> pd.DataFrame:
+    """Extend the bundled BTCUSDT klines to any interval and length by block-bootstrapping log returns.
+
+    Returns of the closest bundled series are rescaled to the target bar length (square-root of
+    time), resampled in blocks to keep volatility clustering, and turned into OHLCV bars.
+    """
+    timeframe = TimeFrame.from_str(interval)
+    source = '1d' if timeframe.value.annualized_factor <= 365 else '4h'
+    source_close = pd.read_csv(os.path.join(KLINES_DIR, f'btcusdt_{source}.csv'), usecols=['timestamp', 'close'],
+                               index_col=0, parse_dates=True)['close']
+
+    log_ret = np.diff(np.log(source_close.to_numpy()))
+    scale = np.sqrt(TimeFrame.from_time_delta(source_close.index[1] - source_close.index[0]).value.annualized_factor
+                    / timeframe.value.annualized_factor)
+    n_bars = int(years * timeframe.value.annualized_factor)
+
+    rng = np.random.default_rng(seed)
+    block = 50
+    starts = rng.integers(0, len(log_ret) - block, size=n_bars // block + 1)
+    sampled = log_ret[(starts[:, None] + np.arange(block)).ravel()[:n_bars]] * scale
+    close = source_close.iloc[0] * np.exp(np.cumsum(sampled))
+
+    open_ = np.concatenate([[source_close.iloc[0]], close[:-1]])
+    wick = np.abs(rng.normal(0, np.abs(sampled).mean(), size=(2, n_bars)))
+    index = pd.date_range('2019-01-01', periods=n_bars, freq=timeframe.value.time_delta, name='timestamp')
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + wick[0]),
+        'low': np.minimum(open_, close) * (1 - wick[1]),
+        'close': close,
+        'volume': rng.lognormal(5, 1, n_bars),
+    }, index=index)
+    df.attrs['timeframe'] = timeframe.value.time_frame_str
+    return df
+
+def measure(func: Callable, repeat: int = 3) -> dict:
+    """Time `func` with perf_counter (best and mean of `repeat` runs), then record its peak traced memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate run because tracemalloc slows the code down
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'best_s': min(timings), 'mean_s': float(np.mean(timings)), 'peak_mb': peak / 1024 ** 2}
+
+def _cases(size: str, tmp_dir: str):
+    """Yield (name, params, func) for every hot path at every data and grid size."""
+    for interval, years in SIZES[size]:
+        df = synthetic_klines(interval, years)
+        params = {'interval': interval, 'years': years, 'n_bars': len(df)}
+
+        def engine_run(df=df):
+            BacktestEngine(df, double_rsi_momentum, df, 0.00055, rsi_short=17, rsi_long=65).run()
+        yield 'engine.run', params, engine_run
+
+        for name in ['ma_pct_diff', 'z_score', 'min_max_scaler', 'precentile_rank', 'robust_scaling', 'rsi']:
+            indicator = getattr(models, name)
+            yield f'models.{name}', params, lambda df=df, indicator=indicator: indicator(df['close'], 20)
+
+        csv_path = os.path.join(tmp_dir, f'synthetic_{interval}.csv')
+        df.to_csv(csv_path)
+        yield 'read_klines.csv', params, lambda csv_path=csv_path: pd.read_csv(csv_path, usecols=['timestamp', 'close'],
+                                                                                index_col=0, parse_dates=True)
+        convert_klines(csv_path)
+        yield 'read_klines.store', params, lambda csv_path=csv_path: read_klines(csv_path, columns=['close'])
+
+    # Optimizer sweeps run on the smallest intraday size to keep the suite short
+    interval, years = SIZES[size][1]
+    df = synthetic_klines(interval, years)
+    for n_short, n_long in GRIDS[size]:
+        grid = {'rsi_short': np.linspace(5, 60, n_short).round(), 'rsi_long': np.linspace(30, 100, n_long).round()}
+        for mode in ['serial', 'batch']:
+            params = {'interval': interval, 'years': years, 'n_bars': len(df), 'grid': n_short * n_long, 'mode': mode}
+            yield 'optimizer.run', params, lambda grid=grid, batch=mode == 'batch': Optimizer(
+                df, double_rsi_momentum, df, 0.00055, **grid).run(batch=batch)
+
+    params = {'interval': interval, 'years': years, 'n_bars': len(df)}
+    cache_dir = os.path.join(tmp_dir, 'result_cache')
+    yield 'optimizer.run.cached', params, lambda: cached_sweep(df, cache_dir)
+
+    for interval in ['1d', '4h']:
+        params = {'interval': interval}
+        yield 'fetch_price', params, lambda interval=interval: _fetch_bundled(interval)
+
+def cached_sweep(df: pd.DataFrame, cache_dir: str) -> dict:
+    """Run a grid, rerun it and widen it with the result cache on, checking the repeats are cache hits.
+
+    Uses the README strategy, which adds columns to its alpha frame on every call.
+    """
+    cache = result_cache.ResultCache(cache_dir, enabled=True)
+    previous, result_cache._cache = result_cache._cache, cache
+    try:
+        cache.clear()
+        alpha = df.copy()
+        grid = {'rsi_short': np.array([10, 20]), 'rsi_long': np.array([40, 60])}
+        wide = {'rsi_short': np.array([10, 20, 30]), 'rsi_long': np.array([40, 60])}
+        for params in (grid, grid, wide):
+            Optimizer(df, readme_double_rsi_momentum, alpha, 0.00055, **params).run()
+        engine = BacktestEngine(df, readme_double_rsi_momentum, alpha, 0.00055, rsi_short=10, rsi_long=40)
+        engine.run()
+        engine.run()
+    finally:
+        result_cache._cache = previous
+    # 4 + 2 new combinations and the first engine run miss; 4 + 4 repeats and the second engine run hit
+    if (cache.hits, cache.misses) != (9, 7):
+        raise RuntimeError(f'Result cache missed repeated backtests: {cache.hits} hits, {cache.misses} misses.')
+    return cache.info()
+
+def _fetch_bundled(interval: str) -> pd.DataFrame:
+    return fetch_price(start='2019-01', end='2024-09', asset='btcusdt', interval=interval)
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(__file__),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(size: str = 'quick',
+                   repeat: int = 3,
+                   pattern: str | None = None,
+                   output: str | None = None) -> pd.DataFrame:
+    """Run the benchmark suite offline and optionally write the results as JSON."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix='backtest_bench_') as tmp_dir:
+        for name, params, func in _cases(size, tmp_dir):
+            if pattern and pattern not in name:
+                continue
+            results.append({'name': name, **params, **measure(func, repeat)})
+            print(f"{name:<24}{json.dumps(params):<70}{results[-1]['best_s']:>10.4f}s")
+
+    if output is not None:
+        report = {
+            'commit': _git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'size': size,
+            'repeat': repeat,
+            'results': results,
+        }
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+    return pd.DataFrame(results)
+
+def compare(baseline: str, candidate: str) -> pd.DataFrame:
+    """Compare two result files; `speedup` > 1 means the candidate is faster."""
+    frames = []
+    for path in (baseline, candidate):
+        with open(path) as f:
+            frames.append(pd.DataFrame(json.load(f)['results']))
+
+    keys = [c for c in frames[0].columns if c not in ('best_s', 'mean_s', 'peak_mb')]
+    merged = frames[0].merge(frames[1], on=keys, suffixes=('_baseline', '_candidate'))
+    merged['speedup'] = merged['best_s_baseline'] / merged['best_s_candidate']
+    merged['memory_ratio'] = merged['peak_mb_candidate'] / merged['peak_mb_baseline']
+    return merged
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the backtest hot paths on synthetic data.')
+    parser.add_argument('--size', choices=list(SIZES), default='quick')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', dest='pattern', default=None, help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', default=None, help='baseline results file to compare the new run against')
+    args = parser.parse_args()
+
+    run_benchmarks(args.size, args.repeat, args.pattern, args.output)
+    if args.compare:
+        print(compare(args.compare, args.output).to_string())
\ No newline at end of file
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+import warnings
+from dataclasses import dataclass
+from math import ceil, e
+from statistics import NormalDist
+
+from . import metrics, vectorized
+from .timeframe import TimeFrame
+
+METRICS = ['Sharpe', 'Calmar', 'Max Drawdown', 'Annual Return']
+# Euler-Mascheroni constant, used by the expected maximum Sharpe of the deflated Sharpe ratio
+EULER_GAMMA = 0.5772156649015329
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """Observed metrics and their resampled distributions for one or more pnl columns."""
+    observed: pd.DataFrame  # strategy x metric
+    replicates: dict[str, pd.DataFrame]  # metric -> (replicate x strategy)
+    p_value: pd.Series  # share of zero-mean replicates with a Sharpe at least the observed one
+    method: str
+
+    def summary(self, confidence: float = 0.95) -> pd.DataFrame:
+        """Observed value, mean, std and confidence interval of every metric and strategy."""
+        tail = (1 - confidence) / 2
+        rows = []
+        for metric in METRICS:
+            values = self.replicates[metric]
+            rows.append(pd.DataFrame({
+                'metric': metric,
+                'observed': self.observed[metric],
+                'mean': values.mean(),
+                'std': values.std(),
+                'lower': values.quantile(tail),
+                'median': values.median(),
+                'upper': values.quantile(1 - tail),
+                'p_value': self.p_value if metric == 'Sharpe' else np.nan,
+            }))
+        summary = pd.concat(rows).set_index('metric', append=True)
+        return summary.droplevel(0) if len(self.observed) == 1 else summary
+
+
+def _as_matrix(pnl: pd.Series | pd.DataFrame | np.ndarray) -> tuple[np.ndarray, pd.Index]:
+    """Get a (bars x strategies) array without the bars that are NaN in every column."""
+    if isinstance(pnl, pd.Series):
+        pnl = pnl.to_frame()
+    if isinstance(pnl, pd.DataFrame):
+        columns = pnl.columns
+        values = pnl.to_numpy(dtype=float)
+    else:
+        values = np.asarray(pnl, dtype=float)
+        values = values[:, None] if values.ndim == 1 else values
+        columns = pd.RangeIndex(values.shape[1])
+    return values[~np.isnan(values).all(axis=1)], columns
+
+def _annualized_factor(pnl, annualized_factor: int | None) -> int:
+    if annualized_factor is not None:
+        return annualized_factor
+    if not isinstance(pnl, (pd.Series, pd.DataFrame)):
+        raise ValueError('annualized_factor is required for arrays without a time index.')
+    return TimeFrame.from_data(pnl).value.annualized_factor
+
+def resample_indices(rng: np.random.Generator, n: int, size: int, method: str, block_size: int) -> np.ndarray:
+    """Draw (n x size) bar indices: one resampled path per column.
+
+    Every path consumes the same number of uniforms in order, so the paths do not depend on how
+    the replicates are split into chunks.
+    """
+    if method == 'permutation':
+        return np.argsort(rng.random((size, n)), axis=1).T
+    if method == 'block':
+        # Moving blocks of fixed length, concatenated and cut to n bars
+        n_blocks = ceil(n / block_size)
+        starts = (rng.random((size, n_blocks)) * (n - block_size + 1)).astype(np.int64).T[:, None, :]
+        return (starts + np.arange(block_size)[None, :, None]).reshape(n_blocks * block_size, size)[:n]
+    if method == 'stationary':
+        # Blocks with geometric lengths (mean block_size) that wrap around the end of the sample
+        uniforms = rng.random((size, 2, n))
+        new_block = uniforms[:, 0].T < 1 / block_size
+        new_block[0] = True
+        block_start = np.maximum.accumulate(np.where(new_block, np.arange(n)[:, None], 0), axis=0)
+        starts = np.take_along_axis((uniforms[:, 1].T * n).astype(np.int64), block_start, axis=0)
+        return (starts + np.arange(n)[:, None] - block_start) % n
+    raise ValueError(f'Unsupported resampling method: {method}')
+
+def _path_metrics(pnl: np.ndarray, annualized_factor: int) -> dict[str, np.ndarray]:
+    """Calculate the metrics of every path along axis 0 with the engine's kernels."""
+    drawdown = vectorized.drawdown(vectorized.nan_cumsum(pnl))
+    annual_return = metrics.annual_return(pnl, annualized_factor)
+    max_drawdown = metrics.max_drawdown(drawdown)
+    return {
+        'Sharpe': metrics.sharpe_ratio(pnl, annualized_factor),
+        'Calmar': metrics.calmar_ratio(annual_return, max_drawdown),
+        'Max Drawdown': max_drawdown,
+        'Annual Return': annual_return,
+    }
+
+def bootstrap_metrics(pnl: pd.Series | pd.DataFrame | np.ndarray,
+                      annualized_factor: int | None = None,
+                      n_replicates: int = 1000,
+                      method: str = 'block',
+                      block_size: int | None = None,
+                      chunk_size: int | None = None,
+                      max_bytes: int = 256 * 1024 ** 2,
+                      seed: int | None = None) -> BootstrapResult:
+    """Resample an engine's pnl, or a (bars x combinations) sweep pnl matrix, and recompute its metrics.
+
+    `method` is 'block' (moving blocks of `block_size` bars, n^(1/3) by default), 'stationary'
+    (random block lengths with that mean) or 'permutation' (bar order shuffled, which changes the
+    path metrics but not the Sharpe). Replicates are computed as matrix operations in chunks that
+    stay under `max_bytes` unless `chunk_size` is given. `seed` makes the draws reproducible.
+    For a sweep, pass `vectorized.pnl_from_cum_pnl(optimizer.pnls_df.to_numpy())` from a run
+    without `downsample`.
+    """
+    annualized_factor = _annualized_factor(pnl, annualized_factor)
+    values, columns = _as_matrix(pnl)
+    n, k = values.shape
+    block_size = block_size or max(1, round(n ** (1 / 3)))
+    if chunk_size is None:
+        # The gathered (bars x chunk x strategies) array dominates the memory of a chunk
+        chunk_size = max(1, min(n_replicates, max_bytes // (n * k * 8 * 4)))
+
+    observed = _path_metrics(values, annualized_factor)
+    observed_mean = np.nanmean(values, axis=0)
+    rng = np.random.default_rng(seed)
+    replicates = {metric: np.empty((n_replicates, k)) for metric in METRICS}
+    exceed = np.zeros(k)
+
+    for start in range(0, n_replicates, chunk_size):
+        size = min(chunk_size, n_replicates - start)
+        paths = values[resample_indices(rng, n, size, method, block_size)]  # bars x chunk x strategies
+        result = _path_metrics(paths, annualized_factor)
+        for metric in METRICS:
+            replicates[metric][start:start + size] = result[metric]
+
+        # Shifting every path by the observed mean imposes the zero-mean null on the Sharpe
+        with np.errstate(divide='ignore', invalid='ignore'):
+            centered = (np.nanmean(paths, axis=0) - observed_mean) / np.nanstd(paths, axis=0, ddof=1)
+        exceed += (centered * np.sqrt(annualized_factor) >= observed['Sharpe']).sum(axis=0)
+
+    p_value = np.full(k, np.nan) if method == 'permutation' else (exceed + 1) / (n_replicates + 1)
+    return BootstrapResult(
+        observed=pd.DataFrame({metric: np.atleast_1d(observed[metric]) for metric in METRICS}, index=columns),
+        replicates={metric: pd.DataFrame(replicates[metric], columns=columns) for metric in METRICS},
+        p_value=pd.Series(p_value, index=columns, name='p_value'),
+        method=method,
+    )
+
+def deflated_sharpe(pnl: pd.Series | pd.DataFrame | np.ndarray,
+                    annualized_factor: int | None = None,
+                    trial_sharpes: np.ndarray | pd.Series | None = None) -> float | pd.Series:
+    """Probability that the true Sharpe exceeds the best one expected from luck across the trials.
+
+    Follows Bailey and Lopez de Prado (2014), correcting for skewness, kurtosis and the number and
+    dispersion of the trials' Sharpe ratios. `trial_sharpes` are the annualized Sharpes of every
+    combination tried (e.g. `optimizer.results_df['Sharpe']`); for a pnl matrix they default to its
+    columns. Without trials this is the probabilistic Sharpe ratio against zero.
+    """
+    annualized_factor = _annualized_factor(pnl, annualized_factor)
+    values, columns = _as_matrix(pnl)
+    if trial_sharpes is None and values.shape[1] > 1:
+        trial_sharpes = metrics.sharpe_ratio(values, annualized_factor)
+
+    sharpe_0 = 0.0
+    if trial_sharpes is not None:
+        trials = np.asarray(trial_sharpes, dtype=float)
+        trials = trials[np.isfinite(trials)] / np.sqrt(annualized_factor)
+        if len(trials) > 1:
+            normal = NormalDist()
+            expected_max = ((1 - EULER_GAMMA) * normal.inv_cdf(1 - 1 / len(trials))
+                            + EULER_GAMMA * normal.inv_cdf(1 - 1 / (len(trials) * e)))
+            sharpe_0 = np.std(trials, ddof=1) * expected_max
+
+    n = np.count_nonzero(~np.isnan(values), axis=0)
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0, ddof=1)
+    # Flat columns (no trades) have no Sharpe and get a NaN probability
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        sharpe = mean / std
+        z = (values - mean) / np.nanstd(values, axis=0)
+        skew = np.nanmean(z ** 3, axis=0)
+        kurtosis = np.nanmean(z ** 4, axis=0)
+        stat = (sharpe - sharpe_0) * np.sqrt(n - 1) / np.sqrt(1 - skew * sharpe + (kurtosis - 1) / 4 * sharpe ** 2)
+    probability = np.array([np.nan if np.isnan(s) else NormalDist().cdf(s) for s in stat])
+
+    if isinstance(pnl, pd.DataFrame) or (not isinstance(pnl, pd.Series) and np.ndim(pnl) == 2):
+        return pd.Series(probability, index=columns, name='deflated_sharpe')
+    return float(probability[0])
\ No newline at end of file
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+import os
+import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Iterable
+
+from . import metrics, vectorized
+from .fee import TransactionCost
+from .metrics import compute_metrics
+from .parallel import FrameSpec, attach_frame, make_shared_dir, publish_frame
+from .timeframe import TimeFrame
+
+StrategyEntry = tuple[Callable, pd.DataFrame | pd.Series, dict]
+
+
+def _strategy_signal(data: pd.DataFrame | FrameSpec,
+                     alpha: pd.DataFrame | pd.Series | FrameSpec,
+                     strategy_function: Callable,
+                     params: dict) -> np.ndarray:
+    """Evaluate one strategy and align its signal to the price index; frames may be published specs."""
+    if isinstance(data, FrameSpec):
+        data = attach_frame(data)
+    if isinstance(alpha, FrameSpec):
+        alpha = attach_frame(alpha)
+    return vectorized.align_signal(strategy_function(alpha, **params), data.index)
+
+def _strategy_names(strategies: list[StrategyEntry]) -> list[str]:
+    names = []
+    for strategy_function, _, params in strategies:
+        name = strategy_function.__name__
+        if params:
+            name += '(' + ', '.join(f'{key}={value}' for key, value in params.items()) + ')'
+        # Keep the names unique when the same entry appears twice
+        names.append(name if name not in names else f'{name} #{names.count(name) + 1}')
+    return names
+
+
+class EnsembleBacktest:
+    """Backtest many different strategies on the same price data and combine them into one portfolio.
+
+    `strategies` is a list of (strategy_function, alpha, params) entries, or a dict of them by
+    name. Price returns are computed once and the strategies' signals are stacked into one
+    (bars x strategies) array, so positions, costs and PnL of every strategy come from a single
+    vectorized pass. `transaction_cost` may be a single cost or one per strategy. `weighting` is
+    'equal' or 'risk_parity' (inverse trailing PnL volatility over `vol_window` bars).
+    """
+    def __init__(self,
+                 data: pd.DataFrame,
+                 strategies: Iterable[StrategyEntry] | dict[str, StrategyEntry],
+                 transaction_cost: float | TransactionCost | list[float] = 0,
+                 weighting: str = 'equal',
+                 vol_window: int = 30):
+        if weighting not in ('equal', 'risk_parity'):
+            raise ValueError(f'Unsupported weighting: {weighting}')
+
+        if isinstance(strategies, dict):
+            self.names = list(strategies.keys())
+            self.strategies = list(strategies.values())
+        else:
+            self.strategies = list(strategies)
+            self.names = _strategy_names(self.strategies)
+        self.data = data
+        self.transaction_cost = transaction_cost
+        self.weighting = weighting
+        self.vol_window = vol_window
+
+        self.timeframe_str = TimeFrame.from_data(data).name
+        self.annualized_factor = TimeFrame[self.timeframe_str].value.annualized_factor
+
+        self.metrics = None  # BacktestMetrics of the combined portfolio, set by run()
+        self.strategy_metrics = None  # statistics of each standalone strategy
+        self.correlation = None  # strategy x strategy correlation of the standalone PnL
+
+    def _signals(self, n_jobs: int, executor: Executor | None) -> np.ndarray:
+        """Evaluate every strategy, in worker processes when `n_jobs` != 1 or an `executor` is given."""
+        if n_jobs == 1 and executor is None:
+            return np.column_stack([_strategy_signal(self.data, alpha, strategy_function, params)
+                                    for strategy_function, alpha, params in self.strategies])
+
+        shared_dir = make_shared_dir()
+        owns_executor = executor is None
+        try:
+            # Each distinct alpha frame is published once, however many strategies read it
+            data_spec = publish_frame(self.data[['close']], os.path.join(shared_dir, 'data'))
+            alpha_specs = {}
+            for _, alpha, _ in self.strategies:
+                if id(alpha) not in alpha_specs:
+                    alpha_specs[id(alpha)] = publish_frame(alpha, os.path.join(shared_dir, f'alpha_{len(alpha_specs)}'))
+
+            if owns_executor:
+                executor = ProcessPoolExecutor(max_workers=os.cpu_count() if n_jobs is None or n_jobs < 1 else n_jobs)
+            futures = [executor.submit(_strategy_signal, data_spec, alpha_specs[id(alpha)], strategy_function, params)
+                       for strategy_function, alpha, params in self.strategies]
+            return np.column_stack([future.result() for future in futures])
+        finally:
+            if owns_executor and executor is not None:
+                executor.shutdown()
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+    def _cost_vector(self) -> np.ndarray:
+        if isinstance(self.transaction_cost, (list, tuple, np.ndarray, pd.Series)):
+            return np.asarray(self.transaction_cost, dtype=float)
+        return np.full(len(self.strategies), float(self.transaction_cost))
+
+    def _weights(self, pnl: np.ndarray) -> np.ndarray:
+        n_bars, n_strategies = pnl.shape
+        if self.weighting == 'equal':
+            return np.full((n_bars, n_strategies), 1 / n_strategies)
+        return vectorized.inverse_volatility_weights(pnl, self.vol_window)
+
+    def run(self, n_jobs: int = 1, executor: Executor | None = None) -> None:
+        """Evaluate every strategy (in `n_jobs` processes, -1 for all cores) and build the combined portfolio."""
+        signals = self._signals(n_jobs, executor)
+        price_ret = vectorized.price_returns(self.data['close'].to_numpy(dtype=float))
+        costs = self._cost_vector()
+
+        # Standalone strategies, then each strategy sized by its portfolio weight
+        standalone = vectorized.backtest_signals(price_ret, signals, costs)
+        weights = self._weights(standalone['pnl'])
+        weighted = vectorized.backtest_signals(price_ret, signals, costs, weights)
+
+        portfolio = vectorized.combine_weighted(weighted)
+
+        index = self.data.index
+        columns = pd.Index(self.names, name='strategy')
+        self.signals = pd.DataFrame(signals, index=index, columns=columns)
+        self.weights = pd.DataFrame(weights, index=index, columns=columns)
+        self.pnls_df = pd.DataFrame(standalone['pnl'], index=index, columns=columns)
+        self.portfolio = pd.DataFrame(portfolio, index=index)
+
+        self.metrics = compute_metrics(index, portfolio['net_positions'], portfolio['pnl'], portfolio['cum_pnl'],
+                                       portfolio['drawdown'], self.annualized_factor)
+        self.strategy_metrics = pd.DataFrame(metrics.column_metrics(standalone, self.annualized_factor), index=columns)
+        self.correlation = pd.DataFrame(self._correlation(standalone['pnl']), index=columns, columns=columns)
+
+    @staticmethod
+    def _correlation(pnl: np.ndarray) -> np.ndarray:
+        """Pearson correlation of the PnL columns over the bars where every strategy has a PnL."""
+        pnl = pnl[~np.isnan(pnl).any(axis=1)]
+        centered = pnl - pnl.mean(axis=0)
+        scale = np.sqrt((centered ** 2).sum(axis=0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # A flat strategy has no defined correlation
+            return np.clip(centered.T @ centered / np.outer(scale, scale), -1, 1)
+
+    @property
+    def sharpe(self) -> float:
+        return self.metrics.sharpe
+
+    @property
+    def calmar(self) -> float:
+        return self.metrics.calmar
\ No newline at end of file
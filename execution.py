@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass
+
+from . import vectorized
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the loop then runs as plain Python over NumPy arrays
+    njit = None
+
+# Exit codes recorded in the `exit` column
+NO_EXIT, STOP_LOSS, TRAILING_STOP, TAKE_PROFIT, MAX_HOLDING = 0, 1, 2, 3, 4
+
+
+@dataclass(frozen=True)
+class ExecutionRules:
+    """Path-dependent rules applied on top of `positions = signal.shift(1)`.
+
+    Stops and take-profits are fractions of the entry price (the close the position was opened at)
+    and are checked against each bar's high and low, filling at the level or at the open if the bar
+    gaps through it. When a stop and a take-profit are both touched within a bar the stop is
+    assumed to fill first. `max_holding` exits at the close after that many bars. After an exit the
+    position stays flat until the signal changes. `target_vol` scales positions by the annualized
+    target over the trailing `vol_window` return volatility, capped at `max_leverage`.
+    """
+    stop_loss: float | None = None
+    trailing_stop: float | None = None
+    take_profit: float | None = None
+    max_holding: int | None = None
+    target_vol: float | None = None
+    vol_window: int = 30
+    max_leverage: float = 1.0
+
+    @property
+    def uses_intrabar_prices(self) -> bool:
+        return self.stop_loss is not None or self.trailing_stop is not None or self.take_profit is not None
+
+
+def _execution_loop(open_, high, low, close, price_ret, targets, transaction_cost,
+                    stop_loss, trailing_stop, take_profit, max_holding):
+    """Walk the bars once; NaN disables a price rule and max_holding <= 0 disables the holding limit."""
+    n = len(close)
+    positions = np.zeros(n)
+    costs = np.full(n, np.nan)
+    pnl = np.full(n, np.nan)
+    exits = np.zeros(n, dtype=np.int8)
+
+    held = 0.0  # position carried out of the previous bar
+    entry_price = np.nan
+    best_price = np.nan
+    bars_held = 0
+    blocked = 0.0  # sign of the signal that was exited, kept flat until the signal changes
+
+    for t in range(1, n):
+        target = targets[t - 1]
+        if target != target:
+            target = 0.0
+        direction = np.sign(target)
+        if blocked != 0 and direction == blocked:
+            target = 0.0
+        else:
+            blocked = 0.0
+
+        # Rebalance at the previous close; a new or reversed position resets its entry
+        if target != 0 and (held == 0 or np.sign(held) != direction):
+            entry_price = close[t - 1]
+            best_price = close[t - 1]
+            bars_held = 0
+        position = target
+        cost = abs(position - held) * transaction_cost
+        positions[t] = position
+        bar_return = price_ret[t]
+        exit_code = NO_EXIT
+
+        if position != 0:
+            side = np.sign(position)
+            exit_price = np.nan
+            # Protective levels in the direction of the position, tightest first
+            stop = np.nan
+            if stop_loss == stop_loss:
+                stop = entry_price * (1 - side * stop_loss)
+                exit_code = STOP_LOSS
+            if trailing_stop == trailing_stop:
+                trail = best_price * (1 - side * trailing_stop)
+                if stop != stop or side * (trail - stop) > 0:
+                    stop = trail
+                    exit_code = TRAILING_STOP
+            adverse = low[t] if side > 0 else high[t]
+            favorable = high[t] if side > 0 else low[t]
+
+            if stop == stop and side * (open_[t] - stop) <= 0:
+                exit_price = open_[t]
+            elif stop == stop and side * (adverse - stop) <= 0:
+                exit_price = stop
+            else:
+                exit_code = NO_EXIT
+                if take_profit == take_profit:
+                    take = entry_price * (1 + side * take_profit)
+                    if side * (open_[t] - take) >= 0:
+                        exit_price = open_[t]
+                        exit_code = TAKE_PROFIT
+                    elif side * (favorable - take) >= 0:
+                        exit_price = take
+                        exit_code = TAKE_PROFIT
+
+            bars_held += 1
+            if exit_code == NO_EXIT and max_holding > 0 and bars_held >= max_holding:
+                exit_price = close[t]
+                exit_code = MAX_HOLDING
+
+            if exit_code != NO_EXIT:
+                bar_return = exit_price / close[t - 1] - 1
+                cost += abs(position) * transaction_cost
+                blocked = direction
+                held = 0.0
+            else:
+                if side > 0:
+                    best_price = max(best_price, high[t])
+                else:
+                    best_price = min(best_price, low[t])
+                held = position
+        else:
+            held = 0.0
+
+        costs[t] = cost
+        pnl[t] = position * bar_return - cost
+        exits[t] = exit_code
+
+    return positions, costs, pnl, exits
+
+
+_execution_loop_compiled = None if njit is None else njit(cache=True)(_execution_loop)
+
+
+def volatility_targets(signal: np.ndarray, price_ret: np.ndarray, rules: ExecutionRules, annualized_factor: int) -> np.ndarray:
+    """Scale the signal by target / trailing annualized volatility; flat until the window fills."""
+    if rules.target_vol is None:
+        return signal
+    vol = pd.Series(price_ret).rolling(rules.vol_window).std().to_numpy() * np.sqrt(annualized_factor)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        size = np.minimum(rules.target_vol / vol, rules.max_leverage)
+    return signal * np.where(np.isfinite(size), size, 0)
+
+def execute(data: pd.DataFrame,
+            signal: np.ndarray,
+            rules: ExecutionRules,
+            transaction_cost: float = 0,
+            annualized_factor: int = 365) -> dict[str, np.ndarray]:
+    """Apply execution rules to a signal over the open/high/low/close columns of `data`.
+
+    Returns the same arrays as `vectorized.backtest_signals` plus the `exit` code of every bar.
+    """
+    close = data['close'].to_numpy(dtype=float)
+    if rules.uses_intrabar_prices:
+        missing = [column for column in ('open', 'high', 'low') if column not in data]
+        if missing:
+            raise ValueError(f'Stops and take-profits need the {missing} columns.')
+        open_, high, low = (data[column].to_numpy(dtype=float) for column in ('open', 'high', 'low'))
+    else:
+        open_ = high = low = close
+
+    signal = np.asarray(signal, dtype=float)
+    price_ret = vectorized.price_returns(close)
+    targets = volatility_targets(signal, price_ret, rules, annualized_factor)
+
+    loop = _execution_loop if _execution_loop_compiled is None else _execution_loop_compiled
+    nan = float('nan')
+    positions, costs, pnl, exits = loop(
+        open_, high, low, close, price_ret, targets, float(transaction_cost),
+        nan if rules.stop_loss is None else float(rules.stop_loss),
+        nan if rules.trailing_stop is None else float(rules.trailing_stop),
+        nan if rules.take_profit is None else float(rules.take_profit),
+        0 if rules.max_holding is None else int(rules.max_holding),
+    )
+    cum_pnl = vectorized.nan_cumsum(pnl)
+    return {
+        'signal': signal,
+        'positions': positions,
+        'transaction_cost': costs,
+        'pnl': pnl,
+        'cum_pnl': cum_pnl,
+        'drawdown': vectorized.drawdown(cum_pnl),
+        'exit': exits,
+    }
\ No newline at end of file
@@ -2,22 +2,32 @@ import pandas as pd
 
 import os
 
+from .kline_store import read_klines
+from .partitions import load_partitions
+from .resample import resample_klines
 from .timeframe import TimeFrame
 
 
 def fetch_price(start: str,
                 end: str | None = None,
-                asset: str = 'btcusdt',
+                asset: str | list[str] = 'btcusdt',
                 interval: str = '1h',
                 data_source: str = 'binance',
                 ) -> pd.DataFrame:
+    if not isinstance(asset, str):
+        # Wide (time x asset) close prices aligned on the timestamps shared by every asset
+        closes = {name: fetch_price(start, end, name, interval, data_source)['close'] for name in asset}
+        prices = pd.concat(closes, axis=1, join='inner')
+        prices.attrs['timeframe'] = TimeFrame.from_str(interval).value.time_frame_str
+        return prices
+    
     start_date = pd.to_datetime(start)
     if end is None:
         end_date = pd.to_datetime('today')
     else:
         end_date = pd.to_datetime(end)
     
-    time_frame_str = interval.lower()
+    time_frame_str = TimeFrame.from_str(interval).value.time_frame_str
     
     package_dir = os.path.dirname(__file__)
     if data_source == 'binance':
@@ -27,36 +37,20 @@ def fetch_price(start: str,
     
     if time_frame_str != '1m':
         file_path = os.path.join(dir_path, f'{asset}_{time_frame_str}.csv')
-        price_df = pd.read_csv(file_path, usecols=['timestamp', 'close'], index_col=0, parse_dates=True)
+        if os.path.exists(file_path):
+            price_df = read_klines(file_path, columns=['close'], start=start_date, end=end_date)
+        else:
+            # No export for this interval: build it from the monthly 1m partitions
+            price_df = resample_klines(asset, time_frame_str, start_date, end_date, dir_path, columns=['close'])
     else:
-        folder_path = os.path.join(dir_path, f'{asset}_{time_frame_str}')
-        price_df_list = []
-        
-        start_month = start_date.strftime('%Y-%m')
-        end_month = end_date.strftime('%Y-%m')
+        price_df = load_partitions(asset, start_date, end_date, dir_path, columns=['close'])
         
-        for month in pd.date_range(start=start_month, end=end_month, freq='MS'):
-            file_name = f'{asset}_{time_frame_str}_{month.strftime("%Y-%m")}.csv'
-            file_path = os.path.join(folder_path, file_name)
-            
-            temp_df = pd.read_csv(file_path, usecols=['timestamp', 'close'], index_col=0, parse_dates=True)
-            price_df_list.append(temp_df)
-            
-        price_df = pd.concat(price_df_list, axis=0)
-        
-    return price_df[(price_df.index >= start_date) & (price_df.index <= end_date)]
+    price_df = price_df[(price_df.index >= start_date) & (price_df.index <= end_date)]
+    price_df.attrs['timeframe'] = time_frame_str
+    return price_df
 
 def concat_price(df: pd.DataFrame, asset: str = 'btcusdt', data_source: str = 'binance') -> pd.DataFrame:
-    time_delta = df.index[1] - df.index[0]
-    time_frame_str = None
-    
-    for timeframe in TimeFrame:
-        if time_delta == timeframe.value.time_delta:
-            time_frame_str = timeframe.value.time_frame_str
-            break
-    
-    if time_frame_str is None:
-        raise ValueError(f"Unsupported time frame with time delta: {time_delta}")
+    time_frame_str = TimeFrame.from_data(df).value.time_frame_str
     
     package_dir = os.path.dirname(__file__)
     if data_source == 'binance':
@@ -66,21 +60,11 @@ def concat_price(df: pd.DataFrame, asset: str = 'btcusdt', data_source: str = 'b
     
     if time_frame_str != '1m':
         file_path = os.path.join(dir_path, f'{asset}_{time_frame_str}.csv')
-        price_df = pd.read_csv(file_path, usecols=['timestamp', 'close'], index_col=0, parse_dates=True)
+        if os.path.exists(file_path):
+            price_df = read_klines(file_path, columns=['close'])
+        else:
+            price_df = resample_klines(asset, time_frame_str, df.index[0], df.index[-1], dir_path, columns=['close'])
     else:
-        folder_path = os.path.join(dir_path, f'{asset}_{time_frame_str}')
-        price_df_list = []
-        
-        start_month = df.index[0].strftime('%Y-%m')
-        end_month = df.index[-1].strftime('%Y-%m')
-        
-        for month in pd.date_range(start=start_month, end=end_month, freq='MS'):
-            file_name = f'{asset}_{time_frame_str}_{month.strftime("%Y-%m")}.csv'
-            file_path = os.path.join(folder_path, file_name)
-            
-            temp_df = pd.read_csv(file_path, usecols=['timestamp', 'close'], index_col=0, parse_dates=True)
-            price_df_list.append(temp_df)
-            
-        price_df = pd.concat(price_df_list, axis=0)
+        price_df = load_partitions(asset, df.index[0], df.index[-1], dir_path, columns=['close'])
     
     return pd.concat([df, price_df], axis=1, join='inner')
\ No newline at end of file
@@ -1,8 +1,23 @@
+import numpy as np
 import pandas as pd
 
+from dataclasses import dataclass
 from typing import Callable, Tuple
+from . import metrics, vectorized
 from .backtest_engine import BacktestEngine
 from .fee import TransactionCost
+from .parallel import evaluate_grid, run_grid_parallel
+from .timeframe import TimeFrame
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    folds: pd.DataFrame
+    oos_pnl: pd.Series
+    
+    @property
+    def oos_cum_pnl(self) -> pd.Series:
+        return self.oos_pnl.cumsum()
 
 
 def split_and_backtest(data: pd.DataFrame, 
@@ -18,11 +33,148 @@ def split_and_backtest(data: pd.DataFrame,
     in_smaple_alpha = alpha.iloc[:split_index].copy()
     out_of_sample_alpha = alpha.iloc[split_index:].copy()
 
-    # Create the backtest engine instance and run the backtest
+    # Create the backtest engine instance and run the backtest; run() reuses results from the result cache when it is enabled
     in_smaple_engine = BacktestEngine(in_sample_data, strategy_function, in_smaple_alpha, transaction_cost, **stratergy_params)
     in_smaple_engine.run()
     
     out_of_sample_engine = BacktestEngine(out_of_sample_data, strategy_function, out_of_sample_alpha, transaction_cost, **stratergy_params)
     out_of_sample_engine.run()
     
-    return in_smaple_engine, out_of_sample_engine
\ No newline at end of file
+    return in_smaple_engine, out_of_sample_engine
+
+def walk_forward_splits(n: int,
+                        n_splits: int = 5,
+                        anchored: bool = True,
+                        train_size: int | None = None,
+                        test_size: int | None = None,
+                        purge: int = 0) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Split n bars into consecutive test windows, each trained on the bars before it.
+    
+    Anchored training windows start at the first bar; rolling ones keep `train_size` bars.
+    `purge` bars are dropped between the end of training and the start of testing.
+    """
+    test_size = test_size or n // (n_splits + 1)
+    first_test_start = n - n_splits * test_size
+    train_size = train_size or first_test_start - purge
+    # The first training window needs at least one bar before the purge gap
+    if test_size <= 0 or train_size <= 0 or first_test_start - purge < 1:
+        raise ValueError(f'Not enough data points ({n}) for {n_splits} splits.')
+    
+    splits = []
+    for i in range(n_splits):
+        test_start = first_test_start + i * test_size
+        train_end = test_start - purge
+        train_start = 0 if anchored else max(0, train_end - train_size)
+        splits.append((np.arange(train_start, train_end), np.arange(test_start, test_start + test_size)))
+    return splits
+
+def purged_kfold_splits(n: int, n_splits: int = 5, purge: int = 0, embargo: int = 0) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Split n bars into k contiguous test folds trained on the rest.
+    
+    `purge` bars on both sides of the test fold and a further `embargo` bars after it are
+    removed from training so overlapping signal windows cannot leak into the test fold.
+    """
+    if n_splits < 2 or n_splits > n:
+        raise ValueError(f'Cannot split {n} data points into {n_splits} folds.')
+    splits = []
+    for test in np.array_split(np.arange(n), n_splits):
+        keep = np.ones(n, dtype=bool)
+        keep[max(0, test[0] - purge):test[-1] + 1 + purge + embargo] = False
+        if not keep.any():
+            raise ValueError(f'purge={purge} and embargo={embargo} leave no training data for a fold of {len(test)} bars.')
+        splits.append((np.flatnonzero(keep), test))
+    return splits
+
+def walk_forward(data: pd.DataFrame,
+                 strategy_function: Callable,
+                 alpha: pd.DataFrame | pd.Series,
+                 transaction_cost: float | TransactionCost = 0,
+                 method: str = 'anchored',
+                 n_splits: int = 5,
+                 train_size: int | None = None,
+                 test_size: int | None = None,
+                 purge: int = 0,
+                 embargo: int = 0,
+                 metric: str = 'Sharpe',
+                 n_jobs: int = 1,
+                 **stratergy_params) -> ValidationResult:
+    """Validate a strategy over anchored or rolling walk-forward windows, or purged k-fold.
+    
+    The signal is computed once over the full series and every fold slices the resulting pnl, so
+    out-of-sample indicators never start cold. Params given as arrays are re-optimized on each
+    training window by `metric` ('Sharpe' or 'Calmar'); the grid is evaluated once, in worker
+    processes when `n_jobs` != 1.
+    """
+    if method in ('anchored', 'rolling'):
+        splits = walk_forward_splits(len(data), n_splits, method == 'anchored', train_size, test_size, purge)
+    elif method == 'kfold':
+        splits = purged_kfold_splits(len(data), n_splits, purge, embargo)
+    else:
+        raise ValueError(f'Unsupported validation method: {method}')
+    
+    annualized_factor = TimeFrame.from_data(data).value.annualized_factor
+    param_names = list(stratergy_params.keys())
+    param_values = [np.atleast_1d(v) for v in stratergy_params.values()]
+    param_grid = np.array(np.meshgrid(*param_values)).T.reshape(-1, len(param_values))
+    
+    if len(param_grid) > 1:
+        if n_jobs != 1:
+            *_, cum_pnl = run_grid_parallel(data, strategy_function, alpha, param_names, param_grid,
+                                            transaction_cost, annualized_factor, n_jobs)
+        else:
+            *_, cum_pnl = evaluate_grid(data, strategy_function, alpha, param_names, param_grid,
+                                        transaction_cost, annualized_factor)
+        grid_pnl = vectorized.pnl_from_cum_pnl(cum_pnl)
+        chosen = [_best_combination(grid_pnl[train], metric, annualized_factor) for train, _ in splits]
+    else:
+        chosen = [0] * len(splits)
+    
+    # Full result arrays are only needed for the combinations that were actually selected
+    price_ret = vectorized.price_returns(data['close'].to_numpy(dtype=float))
+    results = {}
+    for j in set(chosen):
+        param_dict = {param_names[i]: param_grid[j][i] for i in range(len(param_names))}
+        signal = vectorized.align_signal(strategy_function(alpha, **param_dict), data.index)
+        results[j] = vectorized.backtest_signals(price_ret, signal, transaction_cost)
+    
+    rows = []
+    oos_pnl = []
+    for fold, ((train, test), j) in enumerate(zip(splits, chosen)):
+        result = results[j]
+        test_pnl = result['pnl'][test]
+        test_cum_pnl = vectorized.nan_cumsum(test_pnl)
+        test_metrics = metrics.compute_metrics(data.index[test], result['positions'][test], test_pnl, test_cum_pnl,
+                                               vectorized.drawdown(test_cum_pnl), annualized_factor)
+        rows.append({
+            'fold': fold,
+            'train_start': data.index[train[0]],
+            'train_end': data.index[train[-1]],
+            'test_start': data.index[test[0]],
+            'test_end': data.index[test[-1]],
+            **{param_names[i]: param_grid[j][i] for i in range(len(param_names))},
+            'train_sharpe': metrics.sharpe_ratio(result['pnl'][train], annualized_factor),
+            'test_sharpe': test_metrics.sharpe,
+            'test_calmar': test_metrics.calmar,
+            'test_annual_return': test_metrics.annual_return,
+            'test_max_drawdown': test_metrics.max_drawdown,
+            'test_no_of_trades': test_metrics.no_of_trades,
+        })
+        oos_pnl.append(pd.Series(test_pnl, index=data.index[test]))
+    
+    folds = pd.DataFrame(rows).set_index('fold')
+    return ValidationResult(folds, pd.concat(oos_pnl).rename('pnl'))
+
+def _best_combination(pnl: np.ndarray, metric: str, annualized_factor: int) -> int:
+    """Get the column with the best in-sample Sharpe or Calmar ratio."""
+    if metric == 'Sharpe':
+        scores = metrics.sharpe_ratio(pnl, annualized_factor)
+    elif metric == 'Calmar':
+        cum_pnl = vectorized.nan_cumsum(pnl)
+        scores = metrics.calmar_ratio(metrics.annual_return(pnl, annualized_factor),
+                                      metrics.max_drawdown(vectorized.drawdown(cum_pnl)))
+    else:
+        raise ValueError(f'Unsupported metric: {metric}')
+    
+    if np.isnan(scores).all():
+        return 0
+    return int(np.nanargmax(scores))
\ No newline at end of file
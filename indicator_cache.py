@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+
+import functools
+import hashlib
+import inspect
+from collections import OrderedDict
+from typing import Callable
+
+FINGERPRINT_MEMO_SIZE = 32  # input series whose fingerprints are remembered by their buffers
+
+class IndicatorCache:
+    """Bounded LRU cache for indicator results keyed by input fingerprints and arguments."""
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2, enabled: bool = False):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._fingerprints = OrderedDict()  # buffer signature -> (shallow view of the input, fingerprint)
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result[0]
+
+    def put(self, key, value) -> None:
+        nbytes = _nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._nbytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (value, nbytes)
+        self._nbytes += nbytes
+        while self._nbytes > self.max_bytes:
+            _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= evicted_nbytes
+            self.evictions += 1
+
+    def fingerprint(self, data) -> tuple:
+        """Fingerprint `data`, hashing a series only the first time its buffers are seen.
+
+        A memo entry holds a shallow view of the series. The view keeps the buffers alive, so their
+        addresses cannot be reused, and copy-on-write makes any later write to the series (or the
+        frame it came from) copy its buffer first, so a changed series never matches a stale entry.
+        """
+        signature = _buffer_signature(data)
+        if signature is None:
+            return fingerprint(data)
+        memo = self._fingerprints.get(signature)
+        if memo is not None:
+            self._fingerprints.move_to_end(signature)
+            return memo[1]
+        result = fingerprint(data)
+        self._fingerprints[signature] = (data.copy(deep=False), result)
+        if len(self._fingerprints) > FINGERPRINT_MEMO_SIZE:
+            self._fingerprints.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._fingerprints.clear()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'nbytes': self._nbytes,
+            'max_bytes': self.max_bytes,
+        }
+
+
+_cache = IndicatorCache()
+
+
+def enable_indicator_cache(max_bytes: int | None = None) -> None:
+    """Turn on memoization of the models.py transforms."""
+    if max_bytes is not None:
+        _cache.max_bytes = max_bytes
+    _cache.enabled = True
+
+def disable_indicator_cache() -> None:
+    """Turn off memoization and drop every cached result."""
+    _cache.enabled = False
+    _cache.clear()
+
+def clear_indicator_cache() -> None:
+    """Drop every cached result and reset the counters."""
+    _cache.clear()
+
+def indicator_cache_info() -> dict:
+    """Get the hit/miss counters and memory usage of the indicator cache."""
+    return _cache.info()
+
+def _nbytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=False))
+    return np.asarray(value).nbytes
+
+def _hash_array(hasher, values: np.ndarray) -> None:
+    if values.dtype == object:
+        values = pd.util.hash_array(values)
+    hasher.update(str(values.dtype).encode())
+    hasher.update(np.ascontiguousarray(values).view(np.uint8).ravel())
+
+def _array_signature(values: np.ndarray) -> tuple:
+    return (values.__array_interface__['data'][0], values.shape, values.strides, values.dtype.str)
+
+def _buffer_signature(data) -> tuple | None:
+    """Identify a numpy-backed series by the memory its values and index live in, or None."""
+    if not isinstance(data, pd.Series) or not isinstance(data.dtype, np.dtype) or data.dtype == object:
+        return None
+    index = data.index
+    if isinstance(index, pd.RangeIndex):
+        index_signature = (index.start, index.stop, index.step)
+    elif isinstance(index.dtype, np.dtype) and index.dtype != object:
+        index_signature = _array_signature(index.to_numpy())
+    else:
+        return None
+    signature = (_array_signature(data.to_numpy()), index_signature, data.name)
+    try:
+        hash(signature)
+    except TypeError:
+        return None
+    return signature
+
+def fingerprint(data) -> tuple:
+    """Hash the values and index of a series so equal inputs share a cache key."""
+    hasher = hashlib.blake2b(digest_size=16)
+    if isinstance(data, pd.DataFrame):
+        for column in data.columns:
+            hasher.update(repr(column).encode())
+            _hash_array(hasher, data[column].to_numpy())
+    elif isinstance(data, pd.Series):
+        _hash_array(hasher, data.to_numpy())
+    else:
+        _hash_array(hasher, np.asarray(data))
+        return (type(data).__name__, hasher.hexdigest())
+
+    if isinstance(data.index, pd.RangeIndex):
+        hasher.update(repr((data.index.start, data.index.stop, data.index.step)).encode())
+    else:
+        _hash_array(hasher, data.index.to_numpy())
+    name = data.name if isinstance(data, pd.Series) else None
+    return (type(data).__name__, len(data), name, hasher.hexdigest())
+
+def _copy(value):
+    # Hand out copies so callers mutating a result cannot corrupt the cache; copy-on-write makes
+    # a shallow copy enough for pandas objects
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy(deep=False)
+    return value.copy() if hasattr(value, 'copy') else value
+
+def cached_indicator(func: Callable) -> Callable:
+    """Memoize an indicator on a fingerprint of its data argument plus its window arguments."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _cache.enabled:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = [func.__module__, func.__qualname__]
+        for name, value in bound.arguments.items():
+            if isinstance(value, (pd.Series, pd.DataFrame, np.ndarray)):
+                key.append((name, _cache.fingerprint(value)))
+            else:
+                key.append((name, value))
+        key = tuple(key)
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        result = _cache.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            _cache.put(key, result)
+        return _copy(result)
+
+    return wrapper
\ No newline at end of file
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+import json
+import os
+import shutil
+
+# btcusdt_4h.csv -> btcusdt_4h.cols/{column}.npy + meta.json
+STORE_SUFFIX = '.cols'
+META_FILE = 'meta.json'
+
+
+def store_path(csv_path: str) -> str:
+    """Get the columnar store directory that sits next to a kline CSV."""
+    return os.path.splitext(csv_path)[0] + STORE_SUFFIX
+
+def source_signature(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _read_meta(path: str) -> dict | None:
+    try:
+        with open(os.path.join(path, META_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_fresh(csv_path: str, path: str | None = None) -> bool:
+    """Check whether the columnar store at `path` (next to the CSV by default) exists and was built from the current CSV."""
+    meta = _read_meta(store_path(csv_path) if path is None else path)
+    return meta is not None and meta['source'] == source_signature(csv_path)
+
+def convert_klines(csv_path: str) -> str:
+    """Convert a kline CSV into one .npy file per column, with timestamps stored as int64 nanoseconds."""
+    signature = source_signature(csv_path)
+    return write_store(pd.read_csv(csv_path), store_path(csv_path), signature)
+
+def _encode_column(values: pd.Series) -> tuple[str, np.ndarray]:
+    """Get the kind of a kline column and its values, with timestamps as datetime64[ns]."""
+    if pd.api.types.is_numeric_dtype(values):
+        return 'numeric', values.to_numpy()
+    try:
+        return 'datetime', pd.to_datetime(values).to_numpy(dtype='datetime64[ns]')
+    except (ValueError, TypeError):
+        return 'string', values.to_numpy(dtype=str)
+
+def write_store(df: pd.DataFrame, path: str, source: dict) -> str:
+    """Write a frame whose first column is the timestamp as a columnar store built from `source`."""
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    kinds = {}
+    for column in df.columns:
+        kinds[column], array = _encode_column(df[column])
+        if kinds[column] == 'datetime':
+            array = array.view(np.int64)
+        np.save(os.path.join(tmp_path, f'{column}.npy'), array)
+
+    with open(os.path.join(tmp_path, META_FILE), 'w') as f:
+        json.dump({'source': source, 'index': df.columns[0], 'columns': kinds}, f)
+
+    # Swap the finished store in so readers never see a half-written directory
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+def convert_all_klines(dir_path: str | None = None) -> list[str]:
+    """Convert every kline CSV under `price_data/klines`, including monthly 1m partitions."""
+    if dir_path is None:
+        dir_path = os.path.join(os.path.dirname(__file__), 'price_data', 'klines')
+
+    converted = []
+    for root, _, files in os.walk(dir_path):
+        for file_name in sorted(files):
+            csv_path = os.path.join(root, file_name)
+            if file_name.endswith('.csv') and not is_fresh(csv_path):
+                converted.append(convert_klines(csv_path))
+    return converted
+
+def read_klines(csv_path: str,
+                columns: list[str] | None = None,
+                start: pd.Timestamp | None = None,
+                end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Read klines indexed by timestamp, optionally limited to `columns` and the [start, end] range.
+
+    The columnar store is used when present and rebuilt if the CSV changed since it was written.
+    Only the requested columns and rows are read from the memory-mapped files.
+    """
+    path = store_path(csv_path)
+    if not os.path.isdir(path):
+        return _read_csv(csv_path, columns, start, end)
+    if not is_fresh(csv_path):
+        convert_klines(csv_path)
+    return read_store(path, columns, start, end)
+
+def read_store(path: str,
+               columns: list[str] | None = None,
+               start: pd.Timestamp | None = None,
+               end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Read the requested columns and [start, end] rows of a columnar store."""
+    meta = _read_meta(path)
+    index_col = meta['index']
+    if columns is None:
+        columns = [column for column in meta['columns'] if column != index_col]
+
+    timestamps = np.load(os.path.join(path, f'{index_col}.npy'), mmap_mode='r')
+    lo = 0 if start is None else np.searchsorted(timestamps, pd.Timestamp(start).as_unit('ns').value, side='left')
+    hi = len(timestamps) if end is None else np.searchsorted(timestamps, pd.Timestamp(end).as_unit('ns').value, side='right')
+
+    index = pd.DatetimeIndex(np.asarray(timestamps[lo:hi]).view('datetime64[ns]'), name=index_col)
+    data = {}
+    for column in columns:
+        values = np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')[lo:hi]
+        if meta['columns'][column] == 'datetime':
+            values = np.asarray(values).view('datetime64[ns]')
+        data[column] = np.array(values)
+
+    return pd.DataFrame(data, index=index, columns=columns)
+
+def _read_csv(csv_path: str,
+              columns: list[str] | None,
+              start: pd.Timestamp | None,
+              end: pd.Timestamp | None) -> pd.DataFrame:
+    usecols = None if columns is None else lambda column: column == 'timestamp' or column in columns
+    price_df = pd.read_csv(csv_path, usecols=usecols, index_col=0, parse_dates=True)
+    # Same dtypes as the columnar store: a nanosecond index and timestamp columns parsed
+    price_df.index = price_df.index.as_unit('ns')
+    for column in price_df.columns:
+        kind, values = _encode_column(price_df[column])
+        if kind == 'datetime':
+            price_df[column] = values
+    if start is not None:
+        price_df = price_df[price_df.index >= start]
+    if end is not None:
+        price_df = price_df[price_df.index <= end]
+    return price_df
\ No newline at end of file
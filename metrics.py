@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class BacktestMetrics:
+    annual_return: float
+    max_drawdown: float
+    sharpe: float
+    calmar: float
+    exposure: float
+    long_short_ratio: float | str
+    no_of_trades: int
+    dd_duration: int
+    no_of_data_points: int
+    start_date: pd.Timestamp
+    end_date: pd.Timestamp
+
+
+def annual_return(pnl: np.ndarray, annualized_factor: int) -> np.ndarray | float:
+    """Calculate the annualized return along axis 0."""
+    return np.nanmean(pnl, axis=0) * annualized_factor
+
+def max_drawdown(drawdown: np.ndarray) -> np.ndarray | float:
+    """Calculate the maximum drawdown along axis 0."""
+    return np.nanmin(drawdown, axis=0)
+
+def sharpe_ratio(pnl: np.ndarray, annualized_factor: int) -> np.ndarray | float:
+    """Calculate the annualized Sharpe ratio along axis 0."""
+    mean = np.nanmean(pnl, axis=0)
+    std = np.nanstd(pnl, axis=0, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = mean / std * np.sqrt(annualized_factor)
+    return np.where(std == 0, np.nan, sharpe)[()]
+
+def calmar_ratio(annual_return: np.ndarray | float, max_drawdown: np.ndarray | float) -> np.ndarray | float:
+    """Calculate the Calmar ratio from the annualized return and maximum drawdown."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar = annual_return / np.abs(max_drawdown)
+    return np.where(max_drawdown == 0.0, np.nan, calmar)[()]
+
+def drawdown_duration(index: pd.Index, cum_pnl: np.ndarray, drawdown: np.ndarray) -> int:
+    """Calculate the days from the peak before the maximum drawdown until that peak is exceeded."""
+    mdd_loc = np.nanargmin(drawdown)
+    mdd_start_loc = np.nanargmax(cum_pnl[:mdd_loc + 1])
+    
+    new_high = cum_pnl[mdd_loc:] > cum_pnl[mdd_start_loc]
+    new_high_loc = mdd_loc + np.argmax(new_high) if new_high.any() else len(cum_pnl) - 1
+    
+    return (index[new_high_loc] - index[mdd_start_loc]).days
+
+def compute_metrics(index: pd.Index,
+                    positions: np.ndarray,
+                    pnl: np.ndarray,
+                    cum_pnl: np.ndarray,
+                    drawdown: np.ndarray,
+                    annualized_factor: int) -> BacktestMetrics:
+    """Calculate every BacktestEngine statistic in one pass over the result arrays."""
+    mean = np.nanmean(pnl)
+    std = np.nanstd(pnl, ddof=1)
+    annual_return = mean * annualized_factor
+    max_drawdown = np.nanmin(drawdown)
+    sharpe = np.nan if std == 0 else mean / std * np.sqrt(annualized_factor)
+    calmar = np.nan if max_drawdown == 0.0 else annual_return / abs(max_drawdown)
+    
+    long_period = np.count_nonzero(positions > 0)
+    short_period = np.count_nonzero(positions < 0)
+    if short_period == 0:
+        long_short_ratio = 'Long Only'
+    elif long_period == 0:
+        long_short_ratio = 'Short Only'
+    else:
+        long_short_ratio = round(long_period / short_period, 2)
+    
+    return BacktestMetrics(
+        annual_return=annual_return,
+        max_drawdown=max_drawdown,
+        sharpe=sharpe,
+        calmar=calmar,
+        exposure=np.nanmean(np.abs(positions)),
+        long_short_ratio=long_short_ratio,
+        no_of_trades=int(np.nansum(np.abs(np.diff(np.nan_to_num(positions)))) // 2),
+        dd_duration=drawdown_duration(index, cum_pnl, drawdown),
+        no_of_data_points=len(index),
+        start_date=index[0],
+        end_date=index[-1],
+    )
+
+def column_metrics(result: dict[str, np.ndarray], annualized_factor: int) -> dict[str, np.ndarray]:
+    """Calculate the summary statistics of every column of a (bars x columns) `backtest_signals` result at once."""
+    annual_return_ = annual_return(result['pnl'], annualized_factor)
+    max_drawdown_ = max_drawdown(result['drawdown'])
+    return {
+        'Sharpe': sharpe_ratio(result['pnl'], annualized_factor),
+        'Calmar': calmar_ratio(annual_return_, max_drawdown_),
+        'Annual Return': annual_return_,
+        'Max Drawdown': max_drawdown_,
+        'Exposure': np.abs(result['positions']).mean(axis=0),
+        'No of Trades': (np.abs(np.diff(result['positions'], axis=0)).sum(axis=0) // 2).astype(int),
+    }
+
+class RunningMetrics:
+    """Running sums and extremes that keep BacktestMetrics current in O(new bars) per update."""
+    def __init__(self, annualized_factor: int):
+        self.annualized_factor = annualized_factor
+        self.no_of_data_points = 0
+        self.start_date = None
+        self.end_date = None
+        
+        # Welford state of the non-NaN pnl
+        self.pnl_count = 0
+        self.pnl_mean = 0.0
+        self.pnl_m2 = 0.0
+        
+        self.last_cum_pnl = 0.0
+        self.peak = np.nan
+        self.peak_date = None
+        self.max_drawdown = np.nan
+        self.mdd_peak = np.nan
+        self.mdd_start_date = None
+        self.new_high_date = None
+        
+        self.long_period = 0
+        self.short_period = 0
+        self.abs_position_sum = 0.0
+        self.turnover = 0.0
+        self.last_position = None
+    
+    def update(self, index: pd.Index, positions: np.ndarray, pnl: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Fold new rows into the running state and return their cum_pnl and drawdown."""
+        if self.start_date is None:
+            self.start_date = index[0]
+        self.end_date = index[-1]
+        self.no_of_data_points += len(index)
+        
+        self._update_moments(pnl)
+        cum_pnl, drawdown = self._update_drawdown(index, pnl)
+        
+        self.long_period += np.count_nonzero(positions > 0)
+        self.short_period += np.count_nonzero(positions < 0)
+        self.abs_position_sum += np.nansum(np.abs(positions))
+        previous = positions[:1] if self.last_position is None else [self.last_position]
+        self.turnover += np.nansum(np.abs(np.diff(np.nan_to_num(positions), prepend=previous)))
+        self.last_position = np.nan_to_num(positions[-1])
+        
+        return cum_pnl, drawdown
+    
+    def _update_moments(self, pnl: np.ndarray) -> None:
+        valid = pnl[~np.isnan(pnl)]
+        if len(valid) == 0:
+            return
+        
+        # Chan et al. merge of the chunk's two-pass moments into the running ones
+        count = self.pnl_count + len(valid)
+        mean = valid.mean()
+        delta = mean - self.pnl_mean
+        self.pnl_m2 += ((valid - mean) ** 2).sum() + delta ** 2 * self.pnl_count * len(valid) / count
+        self.pnl_mean += delta * len(valid) / count
+        self.pnl_count = count
+    
+    def _update_drawdown(self, index: pd.Index, pnl: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        is_nan = np.isnan(pnl)
+        cum_sum = self.last_cum_pnl + np.cumsum(np.where(is_nan, 0, pnl))
+        self.last_cum_pnl = cum_sum[-1]
+        cum_pnl = np.where(is_nan, np.nan, cum_sum)
+        
+        running_max = np.fmax.accumulate(np.concatenate([[self.peak], cum_pnl]))
+        previous_max, running_max = running_max[:-1], running_max[1:]
+        drawdown = cum_pnl - running_max
+        
+        # Location of the first bar that reached each running max; -1 means an earlier update
+        new_peak = (cum_pnl > previous_max) | (np.isnan(previous_max) & ~is_nan)
+        peak_loc = np.maximum.accumulate(np.where(new_peak, np.arange(len(pnl)), -1))
+        
+        if not np.isnan(drawdown).all():
+            mdd_loc = np.nanargmin(drawdown)
+            if np.isnan(self.max_drawdown) or drawdown[mdd_loc] < self.max_drawdown:
+                self.max_drawdown = drawdown[mdd_loc]
+                self.mdd_peak = running_max[mdd_loc]
+                self.mdd_start_date = index[peak_loc[mdd_loc]] if peak_loc[mdd_loc] >= 0 else self.peak_date
+                self.new_high_date = self._first_date_above(index[mdd_loc:], cum_pnl[mdd_loc:], self.mdd_peak)
+            elif self.new_high_date is None:
+                self.new_high_date = self._first_date_above(index, cum_pnl, self.mdd_peak)
+        
+        if peak_loc[-1] >= 0:
+            self.peak_date = index[peak_loc[-1]]
+        self.peak = running_max[-1]
+        return cum_pnl, drawdown
+    
+    @staticmethod
+    def _first_date_above(index: pd.Index, cum_pnl: np.ndarray, level: float) -> pd.Timestamp | None:
+        above = cum_pnl > level
+        return index[np.argmax(above)] if above.any() else None
+    
+    def snapshot(self) -> BacktestMetrics:
+        """Build the metrics of everything seen so far in O(1)."""
+        mean = self.pnl_mean if self.pnl_count else np.nan
+        std = np.sqrt(self.pnl_m2 / (self.pnl_count - 1)) if self.pnl_count > 1 else np.nan
+        annual_return = mean * self.annualized_factor
+        sharpe = np.nan if std == 0 else mean / std * np.sqrt(self.annualized_factor)
+        calmar = np.nan if self.max_drawdown == 0.0 else annual_return / abs(self.max_drawdown)
+        
+        if self.short_period == 0:
+            long_short_ratio = 'Long Only'
+        elif self.long_period == 0:
+            long_short_ratio = 'Short Only'
+        else:
+            long_short_ratio = round(self.long_period / self.short_period, 2)
+        
+        new_high_date = self.new_high_date if self.new_high_date is not None else self.end_date
+        
+        return BacktestMetrics(
+            annual_return=annual_return,
+            max_drawdown=self.max_drawdown,
+            sharpe=sharpe,
+            calmar=calmar,
+            exposure=self.abs_position_sum / self.no_of_data_points,
+            long_short_ratio=long_short_ratio,
+            no_of_trades=int(self.turnover // 2),
+            dd_duration=(new_high_date - self.mdd_start_date).days,
+            no_of_data_points=self.no_of_data_points,
+            start_date=self.start_date,
+            end_date=self.end_date,
+        )
\ No newline at end of file
@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+from .indicator_cache import cached_indicator
+from .order_statistics import rolling_percentile_rank
+
 
 # def ma_diff(data: pd.Series, ma_short: int = 10, ma_long: int = 20) -> pd.Series:
 #     """Calculate the moving average difference of a time series."""
@@ -8,17 +11,20 @@ import pandas as pd
 #     ma_long = int(ma_long)
 #     return data.rolling(ma_short).mean() - data.rolling(ma_long).mean()
 
+@cached_indicator
 def ma_pct_diff(data: pd.Series, ma: int = 10) -> pd.Series:
     """Calculate the moving average percentage difference of a time series."""
     ma = int(ma)
     return data / data.rolling(ma).mean() - 1
 
+@cached_indicator
 def ma_crossover(data: pd.Series, ma_short: int = 10, ma_long: int = 20) -> pd.Series:
     """Calculate the moving average crossover of a time series."""
     ma_short = int(ma_short)
     ma_long = int(ma_long)
     return np.where(data.rolling(ma_short).mean() > data.rolling(ma_long).mean(), 1, 0)
 
+@cached_indicator
 def z_score(data: pd.Series, window: int = 20) -> pd.Series:
     """Calculate the rolling Z-score of a time series."""
     window = int(window)
@@ -28,16 +34,19 @@ def z_score(data: pd.Series, window: int = 20) -> pd.Series:
     rolling_std = data.rolling(window).std()
     return (data - rolling_mean) / rolling_std
 
+@cached_indicator
 def min_max_scaler(data: pd.Series, window: int = 20) -> pd.Series:
     """Calculate the rolling Min-Max scaling of a time series."""
     window = int(window)
     return (data - data.rolling(window).min()) / (data.rolling(window).max() - data.rolling(window).min())
 
+@cached_indicator
 def precentile_rank(data: pd.Series, window: int = 20) -> pd.Series:
     """Calculate the rolling percentile rank of a time series."""
     window = int(window)
-    return data.rolling(window).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1])
+    return pd.Series(rolling_percentile_rank(data.to_numpy(dtype=float), window), index=data.index, name=data.name)
 
+@cached_indicator
 def robust_scaling(data: pd.Series, window_size: int = 20) -> pd.Series:
     """Calculate the rolling Robust scaling of a time series."""
     window_size = int(window_size)
@@ -48,6 +57,7 @@ def robust_scaling(data: pd.Series, window_size: int = 20) -> pd.Series:
     
     return (data - rolling_median) / rolling_iqr
 
+@cached_indicator
 def rsi(data: pd.Series, window: int = 14) -> pd.Series:
     """Calculate the Relative Strength Index (RSI) of a time series."""
     window = int(window)
@@ -1,12 +1,19 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
+from . import plotting, result_cache
 from .backtest_engine import BacktestEngine
 from .fee import TransactionCost
+from .parallel import evaluate_grid, run_grid_parallel
+from .profiling import Profiler, profile_stage
+from .result_store import ResultStore
+from .search import BayesianSearch, RandomSearch, SuccessiveHalving
+from .timeframe import TimeFrame
+from concurrent.futures import Executor
 from typing import Callable
 
+# Combinations evaluated per vectorized block in batch mode, bounding the (bars x block) arrays
+BATCH_CHUNK_SIZE = 256
 
 
 class Optimizer:
@@ -22,69 +29,183 @@ class Optimizer:
         self.transaction_cost = transaction_cost
         self.strategy_params = strategy_params
         self.bt_results = {}
-        self.pnls_df = pd.DataFrame()
+        self.store = None  # ResultStore with the cumulative PnL curves of the last run
     
-    def run(self):
+    def run(self,
+            batch: bool = False,
+            n_jobs: int = 1,
+            executor: Executor | None = None,
+            chunk_size: int | None = None,
+            progress: Callable[[int, int], None] | None = None,
+            profiler: Profiler | None = None,
+            pnl_dtype: np.dtype | str = np.float64,
+            pnl_path: str | None = None,
+            downsample: int = 1,
+            top_n: int | None = None,
+            top_metric: str = 'Sharpe',
+            search: RandomSearch | SuccessiveHalving | BayesianSearch | None = None):
+        """Backtest every parameter combination, or the ones chosen by a `search` strategy.
+        
+        `batch=True` evaluates the combinations in vectorized blocks of `chunk_size`. `n_jobs` (-1 for
+        all cores) or an `executor` splits the grid into chunks that run in worker processes. `progress`
+        is called with (completed, total) full-history backtests. A `profiler` records every stage of
+        the run; see `profiler.summary()`.
+        
+        The PnL curves go into a preallocated ResultStore (`self.store`, viewed as `pnls_df`):
+        `pnl_dtype='float32'` halves it, `pnl_path` backs it with a memmap file on disk, `downsample`
+        keeps every n-th bar and `top_n` keeps only the best curves by `top_metric`. `results_df`
+        always holds the metrics of every combination this run backtested on the full history.
+        
+        With `enable_result_cache()`, full-history combinations found in the cache are not backtested again.
+        """
         param_values = [v for v in self.strategy_params.values()]  # [array([10, 12, 14, 16, 18]), array([1. , 1.5])]
         param_names = [k for k in self.strategy_params.keys()]  # ['ma', 'diff']
         param_grid = np.array(np.meshgrid(*param_values)).T.reshape(-1, len(param_values))  # [[10.  1.], [12.  1.], [14.  1.], [16.  1.]]
+        if top_metric not in ('Sharpe', 'Calmar'):
+            raise ValueError(f'Unsupported top_metric: {top_metric}')
+        n_total = len(param_grid) if search is None else search.max_evaluations(len(param_grid))
+        self._param_names = param_names
+        self.bt_results = {}  # each run describes only its own combinations, like the store
+        self.store = ResultStore(self.data.index, n_total, pnl_dtype, pnl_path, downsample, top_n)
+        score_column = ['Sharpe', 'Calmar'].index(top_metric)
+        options = dict(batch=batch, n_jobs=n_jobs, executor=executor, chunk_size=chunk_size, profiler=profiler)
+        n_recorded = 0
+        cache = result_cache.active_cache()
+        if cache is not None:
+            base_key = result_cache.base_key(self.data, self.strategy_function, self.alpha, self.transaction_cost,
+                                             self._annualized_factor())
         
-        for combination in param_grid:
-            param_dict = {param_names[i]: combination[i] for i in range(len(param_names))}  # {'ma': 10.0, 'diff': 1.0}
+        def evaluate(rows: np.ndarray, n_bars: int | None = None) -> dict[str, np.ndarray]:
+            """Backtest grid rows on the first `n_bars` bars; full-history results are recorded."""
+            nonlocal n_recorded
+            combinations = param_grid[rows]
+            if n_bars is not None and n_bars < len(self.data):
+                data = self.data.iloc[:n_bars]
+                sharpe, calmar = self._evaluate(data, self.alpha.loc[:data.index[-1]], param_names, combinations,
+                                                on_chunk=lambda *chunk: None, **options)
+                return {'Sharpe': sharpe, 'Calmar': calmar}
             
-            engine = BacktestEngine(self.data, self.strategy_function, self.alpha, self.transaction_cost, **param_dict)
-            engine.run()
-            # concat engine.data['cum_pnl'] to the pnls_df
-            self.pnls_df = pd.concat([self.pnls_df, engine.data['cum_pnl']], axis=1)
-            # renmae the column name to the combination of parameters
-            # self.pnls_df.rename({'cum_pnl': f'{engine.params_str}'}, inplace=True)
-            self.bt_results[tuple(combination)] = (engine.sharpe, engine.calmar)  # {(10.0, 1.0): (0.885685874816949, 0.11145790279401147),
+            offset = n_recorded
+            sharpe = np.empty(len(rows))
+            calmar = np.empty(len(rows))
+            missing = np.arange(len(rows))
+            if cache is not None:
+                # Cached combinations are recorded directly; only the rest are backtested
+                cache_keys = [result_cache.result_key(base_key, dict(zip(param_names, combination)))
+                              for combination in combinations]
+                missing = []
+                for j, key in enumerate(cache_keys):
+                    entry = cache.get(key)
+                    if entry is None:
+                        missing.append(j)
+                        continue
+                    sharpe[j], calmar[j] = entry['sharpe'], entry['calmar']
+                    # Entries cached without arrays leave a NaN curve
+                    cum_pnl = entry['arrays'].get('cum_pnl', np.full(len(self.data), np.nan))
+                    self.store.add(offset + j, tuple(combinations[j]), cum_pnl, (sharpe[j], calmar[j])[score_column])
+                missing = np.array(missing, dtype=int)
+            
+            def store_chunk(start, sharpe, calmar, cum_pnl):
+                with profile_stage(profiler, 'collect', combinations=len(sharpe)):
+                    positions = missing[start:start + len(sharpe)]
+                    keys = [tuple(combination) for combination in combinations[positions]]
+                    if len(missing) == len(rows):
+                        self.store.add_batch(offset + start, keys, cum_pnl, (sharpe, calmar)[score_column])
+                    else:
+                        for j, position in enumerate(positions):
+                            self.store.add(offset + position, keys[j], cum_pnl[:, j], (sharpe, calmar)[score_column][j])
+                    if cache is not None:
+                        for j, position in enumerate(positions):
+                            cache.put(cache_keys[position], sharpe[j], calmar[j], arrays={'cum_pnl': cum_pnl[:, j]})
+            
+            n_cached = len(rows) - len(missing)
+            report = None if progress is None else lambda done, total: progress(offset + n_cached + done, n_total)
+            if len(missing):
+                sharpe[missing], calmar[missing] = self._evaluate(self.data, self.alpha, param_names, combinations[missing],
+                                                                  progress=report, on_chunk=store_chunk, **options)
+            # Chunks may complete in any order, so metrics are merged in grid order afterwards
+            self._collect_metrics(combinations, sharpe, calmar)
+            n_recorded += len(rows)
+            return {'Sharpe': sharpe, 'Calmar': calmar}
+        
+        if search is None:
+            evaluate(np.arange(len(param_grid)))
+        else:
+            search.search(param_grid, evaluate, len(self.data))
             
         self.results_df = pd.DataFrame.from_dict(self.bt_results, orient='index', columns=['Sharpe', 'Calmar'])
         self.results_df.index = pd.MultiIndex.from_tuples(self.results_df.index, names=param_names)
         
         return self.results_df
     
-    def plot_heatmap(self, annot=True, center=None):
-        """Plot heatmaps for Sharpe and Calmar ratios."""
-        # Convert MultiIndex DataFrame to pivot tables for heatmap
-        sharpe_pivot = self.results_df['Sharpe'].unstack(level=-1)
-        calmar_pivot = self.results_df['Calmar'].unstack(level=-1)
-        
-        fig, ax = plt.subplots(1, 2, figsize=(16, 8))
-        
-        # Round x-tick and y-tick labels to avoid floating point errors
-        x_ticks = [f'{x:.2f}' for x in sharpe_pivot.columns]
-        y_ticks = [f'{y:.2f}' for y in sharpe_pivot.index]
-        
-        # Plot Sharpe Ratio Heatmap
-        sns.heatmap(sharpe_pivot, annot=annot, center=center, cmap='PiYG', fmt='.2f', xticklabels=x_ticks, yticklabels=y_ticks, ax=ax[0])
-        ax[0].set_title('Sharpe')
-        ax[0].set_xlabel(list(self.strategy_params.keys())[1])
-        ax[0].set_ylabel(list(self.strategy_params.keys())[0])
-
-        # Plot Calmar Ratio Heatmap
-        sns.heatmap(calmar_pivot, annot=annot, center=center, cmap='PiYG', fmt='.2f', xticklabels=x_ticks, yticklabels=y_ticks, ax=ax[1])
-        ax[1].set_title('Calmar')
-        ax[1].set_xlabel(list(self.strategy_params.keys())[1])
-        ax[1].set_ylabel(list(self.strategy_params.keys())[0])
-        
-        # # set the xticks rotation to 45 degrees
-        plt.setp(ax[0].get_xticklabels(), rotation=30)
-        plt.setp(ax[1].get_xticklabels(), rotation=30)
+    def _annualized_factor(self) -> int:
+        return TimeFrame.from_data(self.data).value.annualized_factor
+    
+    def _evaluate(self,
+                  data: pd.DataFrame,
+                  alpha: pd.DataFrame | pd.Series,
+                  param_names: list[str],
+                  param_grid: np.ndarray,
+                  on_chunk: Callable[[int, np.ndarray, np.ndarray, np.ndarray], None],
+                  batch: bool = False,
+                  n_jobs: int = 1,
+                  executor: Executor | None = None,
+                  chunk_size: int | None = None,
+                  progress: Callable[[int, int], None] | None = None,
+                  profiler: Profiler | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Backtest a block of combinations on `data` and hand every (start, sharpe, calmar, cum_pnl) chunk to `on_chunk`."""
+        if n_jobs != 1 or executor is not None:
+            sharpe, calmar, _ = run_grid_parallel(data, self.strategy_function, alpha, param_names, param_grid,
+                                                  self.transaction_cost, self._annualized_factor(),
+                                                  n_jobs, executor, chunk_size, progress, profiler, on_chunk=on_chunk)
+            return sharpe, calmar
         
-        plt.tight_layout()
-        plt.show()
+        sharpe = np.empty(len(param_grid))
+        calmar = np.empty(len(param_grid))
+        if batch:
+            chunk_size = chunk_size or BATCH_CHUNK_SIZE
+            for start in range(0, len(param_grid), chunk_size):
+                block = param_grid[start:start + chunk_size]
+                block_sharpe, block_calmar, cum_pnl = evaluate_grid(data, self.strategy_function, alpha, param_names, block,
+                                                                    self.transaction_cost, self._annualized_factor(), profiler)
+                sharpe[start:start + len(block)] = block_sharpe
+                calmar[start:start + len(block)] = block_calmar
+                on_chunk(start, block_sharpe, block_calmar, cum_pnl)
+                if progress is not None:
+                    progress(start + len(block), len(param_grid))
+        else:
+            for n, combination in enumerate(param_grid):
+                param_dict = {param_names[i]: combination[i] for i in range(len(param_names))}  # {'ma': 10.0, 'diff': 1.0}
+                
+                engine = BacktestEngine(data, self.strategy_function, alpha, self.transaction_cost, **param_dict)
+                engine.profiler = profiler
+                engine.use_cache = False  # the sweep caches full-history results itself and never prefix runs
+                engine.run()
+                sharpe[n], calmar[n] = engine.sharpe, engine.calmar  # (0.885685874816949, 0.11145790279401147)
+                on_chunk(n, sharpe[n:n + 1], calmar[n:n + 1], engine.data['cum_pnl'].to_numpy()[:, None])
+                if progress is not None:
+                    progress(n + 1, len(param_grid))
+        return sharpe, calmar
+    
+    def _collect_metrics(self, param_grid: np.ndarray, sharpe: np.ndarray, calmar: np.ndarray) -> None:
+        """Merge the metrics of a block of combinations into bt_results in grid order."""
+        for j, combination in enumerate(param_grid):
+            self.bt_results[tuple(combination)] = (sharpe[j], calmar[j])
+    
+    @property
+    def pnls_df(self) -> pd.DataFrame:
+        """Cumulative PnL curves of the last run, one column per stored parameter combination."""
+        if self.store is None:
+            return pd.DataFrame()
+        return self.store.to_frame(self._param_names)
+    
+    def plot_heatmap(self, annot=True, center=None, show: bool = True):
+        """Plot heatmaps for Sharpe and Calmar ratios."""
+        return plotting.plot_heatmap(self, annot, center, show)
     
-    def plot_pnl(self):
+    def plot_pnl(self, show: bool = True):
         """Plot all cumulative PnL curves for each parameter combination."""
-        plt.plot(self.pnls_df, lw=1)
-        plt.title('PnL')
-        # plt.title(engine.strategy_name)
-        plt.grid(alpha=0.3)
-        plt.xticks(rotation=30)
-        plt.tight_layout()
-        plt.show()
+        return plotting.plot_optimizer_pnl(self, show)
     
     @property
     def params(self):
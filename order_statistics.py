@@ -0,0 +1,41 @@
+import numpy as np
+
+from bisect import bisect_left, bisect_right, insort
+
+
+def rolling_percentile_rank(values: np.ndarray, window: int) -> np.ndarray:
+    """Calculate the percentile rank of each value within its trailing window.
+
+    The window is kept sorted incrementally: each bar locates the incoming and outgoing values by
+    binary search instead of re-sorting. Windows that are not yet full or contain NaN yield NaN,
+    matching `rolling(window)` with the default `min_periods`. Ties get their average rank, as in
+    `rank(pct=True)`.
+    """
+    values = np.asarray(values, dtype=float)
+    nan = float('nan')
+    ranks = [nan] * len(values)
+
+    items = values.tolist()
+    sorted_window = []
+    nan_count = 0
+    for i, x in enumerate(items):
+        if x != x:
+            nan_count += 1
+        else:
+            insort(sorted_window, x)
+
+        if i >= window:
+            old = items[i - window]
+            if old != old:
+                nan_count -= 1
+            else:
+                del sorted_window[bisect_left(sorted_window, old)]
+
+        if i < window - 1 or nan_count:
+            continue
+
+        below = bisect_left(sorted_window, x)
+        equal = bisect_right(sorted_window, x) - below
+        ranks[i] = (below + (equal + 1) / 2) / window
+
+    return np.array(ranks)
\ No newline at end of file
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable
+
+from . import metrics, vectorized
+from .profiling import Profiler, profile_stage
+
+
+@dataclass(frozen=True)
+class FrameSpec:
+    directory: str
+    columns: tuple
+    name: object = None
+    is_series: bool = False
+    index_name: object = None
+    tz: str | None = None
+
+
+# Frames attached by this worker process, keyed by their directory
+_ATTACHED_FRAMES = {}
+
+
+def _shared_dir() -> str:
+    """Prefer a RAM-backed directory so memory-mapped arrays live in shared memory."""
+    return '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def make_shared_dir() -> str:
+    """Create a temporary directory for the memory-mapped arrays shared with worker processes."""
+    return tempfile.mkdtemp(prefix='backtest_', dir=_shared_dir())
+
+def _save_array(path: str, values: np.ndarray) -> None:
+    np.save(path, values, allow_pickle=values.dtype == object)
+
+def _load_array(path: str) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode='r')
+    except ValueError:
+        # Object columns cannot be memory-mapped
+        return np.load(path, allow_pickle=True)
+
+def publish_frame(frame: pd.DataFrame | pd.Series, directory: str) -> FrameSpec:
+    """Write the index and every column of a frame to memory-mappable .npy files."""
+    os.makedirs(directory, exist_ok=True)
+    is_series = isinstance(frame, pd.Series)
+    df = frame.to_frame() if is_series else frame
+
+    index = df.index
+    tz = str(index.tz) if getattr(index, 'tz', None) is not None else None
+    index_values = index.tz_localize(None).to_numpy() if tz else index.to_numpy()
+    _save_array(os.path.join(directory, 'index.npy'), index_values)
+    for i, column in enumerate(df.columns):
+        _save_array(os.path.join(directory, f'{i}.npy'), df[column].to_numpy())
+
+    return FrameSpec(directory, tuple(df.columns), frame.name if is_series else None, is_series, index.name, tz)
+
+def attach_frame(spec: FrameSpec) -> pd.DataFrame | pd.Series:
+    """Rebuild a published frame on top of the memory-mapped arrays, once per process."""
+    if spec.directory in _ATTACHED_FRAMES:
+        return _ATTACHED_FRAMES[spec.directory]
+    # Drop frames of earlier runs whose files have already been removed
+    for directory in [d for d in _ATTACHED_FRAMES if not os.path.isdir(d)]:
+        del _ATTACHED_FRAMES[directory]
+
+    index = pd.Index(_load_array(os.path.join(spec.directory, 'index.npy')), name=spec.index_name)
+    if spec.tz:
+        index = index.tz_localize(spec.tz)
+    columns = {column: _load_array(os.path.join(spec.directory, f'{i}.npy')) for i, column in enumerate(spec.columns)}
+    frame = pd.DataFrame(columns, index=index, copy=False)
+    if spec.is_series:
+        frame = frame.iloc[:, 0].rename(spec.name)
+
+    _ATTACHED_FRAMES[spec.directory] = frame
+    return frame
+
+def evaluate_grid(data: pd.DataFrame,
+                  strategy_function: Callable,
+                  alpha: pd.DataFrame | pd.Series,
+                  param_names: list[str],
+                  param_grid: np.ndarray,
+                  transaction_cost: float,
+                  annualized_factor: int,
+                  profiler: Profiler | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Backtest a block of parameter combinations in one vectorized pass."""
+    signals = np.empty((len(data), len(param_grid)))
+    for j, combination in enumerate(param_grid):
+        param_dict = {param_names[i]: combination[i] for i in range(len(param_names))}
+        with profile_stage(profiler, 'signal', **param_dict):
+            signal = strategy_function(alpha, **param_dict)
+            signals[:, j] = vectorized.align_signal(signal, data.index)
+
+    with profile_stage(profiler, 'pnl', combinations=len(param_grid)):
+        price_ret = vectorized.price_returns(data['close'].to_numpy(dtype=float))
+        result = vectorized.backtest_signals(price_ret, signals, transaction_cost)
+
+    with profile_stage(profiler, 'metrics', combinations=len(param_grid)):
+        annual_return = metrics.annual_return(result['pnl'], annualized_factor)
+        sharpe = metrics.sharpe_ratio(result['pnl'], annualized_factor)
+        calmar = metrics.calmar_ratio(annual_return, metrics.max_drawdown(result['drawdown']))
+    return np.atleast_1d(sharpe), np.atleast_1d(calmar), result['cum_pnl']
+
+def _evaluate_chunk(data_spec: FrameSpec,
+                    alpha_spec: FrameSpec,
+                    output_path: str,
+                    start: int,
+                    shared_output: bool,
+                    strategy_function: Callable,
+                    param_names: list[str],
+                    param_grid: np.ndarray,
+                    transaction_cost: float,
+                    annualized_factor: int,
+                    profile_memory: bool | None = None) -> tuple[int, np.ndarray, np.ndarray, list[dict]]:
+    """Worker task: evaluate a chunk and write its cumulative PnL straight into the shared output,
+    or into a file of its own at `output_path` when `shared_output` is False.
+
+    With `profile_memory` set, the chunk is profiled in the worker and its records are returned.
+    """
+    profiler = None if profile_memory is None else Profiler(memory=profile_memory)
+    data = attach_frame(data_spec)
+    alpha = attach_frame(alpha_spec)
+    sharpe, calmar, cum_pnl = evaluate_grid(data, strategy_function, alpha, param_names, param_grid,
+                                            transaction_cost, annualized_factor, profiler)
+
+    with profile_stage(profiler, 'collect', combinations=len(param_grid)):
+        if shared_output:
+            output = np.load(output_path, mmap_mode='r+')
+            output[:, start:start + len(param_grid)] = cum_pnl
+            output.flush()
+        else:
+            np.save(output_path, cum_pnl)
+    return start, sharpe, calmar, [] if profiler is None else profiler.records
+
+def run_grid_parallel(data: pd.DataFrame,
+                      strategy_function: Callable,
+                      alpha: pd.DataFrame | pd.Series,
+                      param_names: list[str],
+                      param_grid: np.ndarray,
+                      transaction_cost: float,
+                      annualized_factor: int,
+                      n_jobs: int = -1,
+                      executor: Executor | None = None,
+                      chunk_size: int | None = None,
+                      progress: Callable[[int, int], None] | None = None,
+                      profiler: Profiler | None = None,
+                      on_chunk: Callable[[int, np.ndarray, np.ndarray, np.ndarray], None] | None = None
+                      ) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Split the grid into chunks and evaluate them in worker processes.
+
+    The price and alpha frames are published once as memory-mapped files and the workers
+    write their cumulative PnL into a shared (bars x combinations) array, so only parameters
+    and metrics travel through pickling. Results are returned in grid order. Worker stage records
+    are merged into `profiler` as chunks complete.
+
+    With `on_chunk`, each chunk is instead written to a file of its own and handed to
+    `on_chunk(start, sharpe, calmar, cum_pnl)` as it completes, so the full (bars x combinations)
+    array is never materialized and None is returned in its place.
+    """
+    n_jobs = os.cpu_count() if n_jobs is None or n_jobs < 1 else n_jobs
+    n_combinations = len(param_grid)
+    if chunk_size is None:
+        chunk_size = max(1, -(-n_combinations // (n_jobs * 4)))
+
+    sharpe = np.empty(n_combinations)
+    calmar = np.empty(n_combinations)
+    shared_dir = make_shared_dir()
+    try:
+        data_spec = publish_frame(data[['close']], os.path.join(shared_dir, 'data'))
+        alpha_spec = publish_frame(alpha, os.path.join(shared_dir, 'alpha'))
+        shared_output = on_chunk is None
+        output_path = os.path.join(shared_dir, 'cum_pnl.npy')
+        if shared_output:
+            np.lib.format.open_memmap(output_path, mode='w+', dtype=float, shape=(len(data), n_combinations)).flush()
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=n_jobs)
+        try:
+            futures = [
+                executor.submit(_evaluate_chunk, data_spec, alpha_spec,
+                                output_path if shared_output else os.path.join(shared_dir, f'cum_pnl_{start}.npy'),
+                                start, shared_output, strategy_function,
+                                param_names, param_grid[start:start + chunk_size], transaction_cost, annualized_factor,
+                                None if profiler is None else profiler.memory)
+                for start in range(0, n_combinations, chunk_size)
+            ]
+            done = 0
+            for future in as_completed(futures):
+                start, chunk_sharpe, chunk_calmar, records = future.result()
+                if profiler is not None:
+                    profiler.extend(records)
+                sharpe[start:start + len(chunk_sharpe)] = chunk_sharpe
+                calmar[start:start + len(chunk_calmar)] = chunk_calmar
+                if not shared_output:
+                    chunk_path = os.path.join(shared_dir, f'cum_pnl_{start}.npy')
+                    on_chunk(start, chunk_sharpe, chunk_calmar, np.load(chunk_path))
+                    os.remove(chunk_path)
+                done += len(chunk_sharpe)
+                if progress is not None:
+                    progress(done, n_combinations)
+        finally:
+            if owns_executor:
+                executor.shutdown()
+
+        cum_pnl = np.array(np.load(output_path, mmap_mode='r')) if shared_output else None
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    return sharpe, calmar, cum_pnl
\ No newline at end of file
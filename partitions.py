@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from .kline_store import read_klines
+
+
+def partition_path(dir_path: str, asset: str, month: pd.Timestamp) -> str:
+    return os.path.join(dir_path, f'{asset}_1m', f'{asset}_1m_{month.strftime("%Y-%m")}.csv')
+
+def partition_months(start: pd.Timestamp, end: pd.Timestamp) -> list[pd.Timestamp]:
+    """Get the first day of every month overlapping [start, end]."""
+    return list(pd.date_range(pd.Timestamp(start).strftime('%Y-%m'), pd.Timestamp(end).strftime('%Y-%m'), freq='MS'))
+
+def check_partitions(dir_path: str, asset: str, months: list[pd.Timestamp]) -> None:
+    """Raise one error naming every missing partition before any of them is read."""
+    missing = [month.strftime('%Y-%m') for month in months if not os.path.exists(partition_path(dir_path, asset, month))]
+    if missing:
+        folder = os.path.dirname(partition_path(dir_path, asset, months[0]))
+        raise FileNotFoundError(f'Missing 1m partitions of {asset} for {", ".join(missing)} in {folder}.')
+
+def map_months(func: Callable[[pd.Timestamp], pd.DataFrame],
+               months: list[pd.Timestamp],
+               max_workers: int | None = None) -> list[pd.DataFrame]:
+    """Apply `func` to every month in a thread pool, keeping month order."""
+    if len(months) <= 1 or max_workers == 1:
+        return [func(month) for month in months]
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(func, months))
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate frames with the same columns by copying each into one preallocated array per column."""
+    if len(frames) == 1:
+        return frames[0]
+    offsets = np.cumsum([0] + [len(frame) for frame in frames])
+    data = {}
+    for column in frames[0].columns:
+        dtypes = [frame[column].dtype for frame in frames]
+        if all(isinstance(dtype, np.dtype) for dtype in dtypes):
+            values = np.empty(offsets[-1], dtype=np.result_type(*dtypes))
+            for frame, lo, hi in zip(frames, offsets[:-1], offsets[1:]):
+                values[lo:hi] = frame[column].to_numpy()
+        else:
+            # Extension dtypes (e.g. strings) are left to pandas
+            values = pd.concat([frame[column] for frame in frames], ignore_index=True).array
+        data[column] = values
+    index = frames[0].index.append([frame.index for frame in frames[1:]])
+    return pd.DataFrame(data, index=index, columns=frames[0].columns, copy=False)
+
+def _default_dir(dir_path: str | None) -> str:
+    return dir_path or os.path.join(os.path.dirname(__file__), 'price_data', 'klines')
+
+def load_partitions(asset: str,
+                    start: pd.Timestamp,
+                    end: pd.Timestamp,
+                    dir_path: str | None = None,
+                    columns: list[str] | None = None,
+                    max_workers: int | None = None) -> pd.DataFrame:
+    """Read the [start, end] rows of the monthly `{asset}_1m_{YYYY-MM}.csv` partitions.
+
+    Only the months overlapping the range are read, concurrently, each trimmed to the range as it
+    is loaded, and the chunks are copied once into the result.
+    """
+    dir_path = _default_dir(dir_path)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    months = partition_months(start, end)
+    check_partitions(dir_path, asset, months)
+    chunks = map_months(lambda month: read_klines(partition_path(dir_path, asset, month), columns, start, end),
+                        months, max_workers)
+    return concat_frames(chunks)
+
+def iter_partitions(asset: str,
+                    start: pd.Timestamp,
+                    end: pd.Timestamp,
+                    dir_path: str | None = None,
+                    columns: list[str] | None = None,
+                    prefetch: int = 2) -> Iterator[pd.DataFrame]:
+    """Yield the [start, end] rows one month at a time, reading up to `prefetch` months ahead in the background."""
+    dir_path = _default_dir(dir_path)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    months = partition_months(start, end)
+    check_partitions(dir_path, asset, months)
+
+    executor = ThreadPoolExecutor(max(1, prefetch))
+    try:
+        submit = lambda month: executor.submit(read_klines, partition_path(dir_path, asset, month), columns, start, end)
+        pending = [submit(month) for month in months[:prefetch + 1]]
+        for i in range(len(months)):
+            chunk = pending.pop(0).result()
+            if i + prefetch + 1 < len(months):
+                pending.append(submit(months[i + prefetch + 1]))
+            yield chunk
+    finally:
+        # A consumer that stops early does not wait for months it will never see
+        executor.shutdown(cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,123 @@
+import pandas as pd
+
+# matplotlib and seaborn are imported inside the functions so that `import backtest` stays
+# headless and fast for workers and scheduled jobs that never plot.
+
+
+def _pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+def _finish(ax, show: bool):
+    ax.grid(alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=30)
+    if show:
+        plt = _pyplot()
+        plt.tight_layout()
+        plt.show()
+    return ax
+
+def rolling_sharpe(engine, days: int = 60) -> pd.Series:
+    return engine.rolling_metrics((days,), ('Sharpe',))['Sharpe', days]
+
+def pnl_label(engine) -> str:
+    return f'{engine.params_str} | sr:{engine.sharpe:.2f} | cr:{engine.calmar:.2f}'
+
+def draw_pnl(ax, cum_pnl: pd.Series, title: str, label: str, benchmark: pd.Series | None = None) -> None:
+    if benchmark is not None:
+        ax.plot(benchmark, lw=1, zorder=0, color='grey', label='Buy and Hold')
+    ax.plot(cum_pnl, label=label, lw=1.5)
+    ax.set_title(title)
+    ax.legend()
+
+def draw_drawdown(ax, drawdown: pd.Series) -> None:
+    ax.plot(drawdown, lw=1.5)
+    ax.set_title('Drawdown')
+
+def draw_rolling_sharpe(ax, rolling_sharpe: pd.Series, days: int, ma: int | None = None, sharpe: float | None = None) -> None:
+    ax.plot(rolling_sharpe, lw=1.5)
+    if ma is not None:
+        ax.plot(rolling_sharpe.rolling(window=ma).mean(), label=f'{ma}-MA')
+        ax.legend()
+    if sharpe is not None and len(rolling_sharpe):
+        ax.hlines(sharpe, rolling_sharpe.index[0], rolling_sharpe.index[-1], colors='red', linestyles='dashed')
+    ax.set_title(f'Rolling Sharpe ({days}-Days)')
+
+def draw_overview(fig, engine_data: pd.DataFrame, rolling_sharpe: pd.Series, title: str, label: str, days: int = 60):
+    """Draw PnL, drawdown and rolling Sharpe panels sharing the time axis onto `fig`."""
+    ax = fig.subplots(3, 1, sharex=True, gridspec_kw={'height_ratios': [4, 1, 1]})
+    draw_pnl(ax[0], engine_data['cum_pnl'], f'{title} PnL', label)
+    draw_drawdown(ax[1], engine_data['drawdown'])
+    draw_rolling_sharpe(ax[2], rolling_sharpe, days)
+    for a in ax:
+        a.grid(alpha=0.3)
+    ax[-1].tick_params(axis='x', labelrotation=30)
+    return ax
+
+def plot_pnl(engine, slice_range: tuple[int, int] | None = None, benchmark: bool = False, show: bool = True):
+    start, end = slice_range if slice_range else (None, None)
+    cum_pnl = engine.data['pnl'].iloc[start:end].cumsum()
+    ax = _pyplot().gca()
+    draw_pnl(ax, cum_pnl, engine.strategy_name, pnl_label(engine),
+             engine.data['price_ret'].cumsum() if benchmark else None)
+    return _finish(ax, show)
+
+def plot_dd(engine, show: bool = True):
+    ax = _pyplot().gca()
+    draw_drawdown(ax, engine.data['drawdown'])
+    return _finish(ax, show)
+
+def plot_positions(engine, show: bool = True):
+    ax = _pyplot().gca()
+    ax.plot(engine.data['positions'])
+    ax.set_title('Positions')
+    return _finish(ax, show)
+
+def plot_rolling_sharpe(engine, days: int = 60, ma: int = 60, sharpe: float = 2, show: bool = True):
+    ax = _pyplot().gca()
+    draw_rolling_sharpe(ax, rolling_sharpe(engine, days).dropna(), days, ma, sharpe)
+    return _finish(ax, show)
+
+def plot(engine, show: bool = True):
+    plt = _pyplot()
+    fig = plt.figure(figsize=(12, 12))
+    draw_overview(fig, engine.data, rolling_sharpe(engine).dropna(), engine.strategy_name, pnl_label(engine))
+    if show:
+        plt.tight_layout()
+        plt.show()
+    return fig
+
+def plot_heatmap(optimizer, annot: bool = True, center: float | None = None, show: bool = True):
+    """Plot heatmaps for Sharpe and Calmar ratios."""
+    import seaborn as sns
+    plt = _pyplot()
+
+    # Convert MultiIndex DataFrame to pivot tables for heatmap
+    sharpe_pivot = optimizer.results_df['Sharpe'].unstack(level=-1)
+    calmar_pivot = optimizer.results_df['Calmar'].unstack(level=-1)
+    param_names = list(optimizer.strategy_params.keys())
+
+    fig, ax = plt.subplots(1, 2, figsize=(16, 8))
+
+    # Round x-tick and y-tick labels to avoid floating point errors
+    x_ticks = [f'{x:.2f}' for x in sharpe_pivot.columns]
+    y_ticks = [f'{y:.2f}' for y in sharpe_pivot.index]
+
+    for a, pivot, title in [(ax[0], sharpe_pivot, 'Sharpe'), (ax[1], calmar_pivot, 'Calmar')]:
+        sns.heatmap(pivot, annot=annot, center=center, cmap='PiYG', fmt='.2f', xticklabels=x_ticks, yticklabels=y_ticks, ax=a)
+        a.set_title(title)
+        a.set_xlabel(param_names[1])
+        a.set_ylabel(param_names[0])
+        plt.setp(a.get_xticklabels(), rotation=30)
+
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return fig
+
+def plot_optimizer_pnl(optimizer, show: bool = True):
+    """Plot all cumulative PnL curves for each parameter combination."""
+    ax = _pyplot().gca()
+    ax.plot(optimizer.pnls_df, lw=1)
+    ax.set_title('PnL')
+    return _finish(ax, show)
\ No newline at end of file
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from typing import Callable
+
+from . import metrics, vectorized
+from .fee import TransactionCost
+from .metrics import compute_metrics
+from .timeframe import TimeFrame
+
+
+class PortfolioBacktest:
+    """Backtest one strategy across the columns of a wide (time x asset) close price frame.
+
+    `alpha` is a dict of per-asset frames, a frame with (asset, field) column MultiIndex, or a
+    wide frame whose columns are passed to the strategy as Series. `transaction_cost` may be a
+    single cost or one per asset. `weighting` is 'equal' or 'volatility' (inverse trailing
+    volatility over `vol_window` bars).
+    """
+    def __init__(self,
+                 prices: pd.DataFrame,
+                 strategy_function: Callable,
+                 alpha: pd.DataFrame | dict,
+                 transaction_cost: float | TransactionCost | pd.Series | dict = 0,
+                 weighting: str = 'equal',
+                 vol_window: int = 30,
+                 **stratergy_params):
+        if weighting not in ('equal', 'volatility'):
+            raise ValueError(f'Unsupported weighting: {weighting}')
+
+        self.prices = prices
+        self.assets = list(prices.columns)
+        self.strategy_function = strategy_function
+        self.alpha = alpha
+        self.transaction_cost = transaction_cost
+        self.weighting = weighting
+        self.vol_window = vol_window
+        self.stratergy_params = stratergy_params
+
+        self.timeframe_str = TimeFrame.from_data(prices).name
+        self.annualized_factor = TimeFrame[self.timeframe_str].value.annualized_factor
+
+        self.metrics = None  # BacktestMetrics of the combined portfolio, set by run()
+        self.asset_metrics = None  # per-asset statistics of each standalone strategy
+
+    def _cost_vector(self) -> np.ndarray:
+        if isinstance(self.transaction_cost, (dict, pd.Series)):
+            return np.array([self.transaction_cost[asset] for asset in self.assets], dtype=float)
+        return np.full(len(self.assets), float(self.transaction_cost))
+
+    def _weights(self, price_ret: np.ndarray) -> np.ndarray:
+        n_bars, n_assets = price_ret.shape
+        if self.weighting == 'equal':
+            return np.full((n_bars, n_assets), 1 / n_assets)
+        return vectorized.inverse_volatility_weights(price_ret, self.vol_window)
+
+    def run(self) -> None:
+        signals = np.column_stack([
+            vectorized.align_signal(self.strategy_function(self.alpha[asset], **self.stratergy_params), self.prices.index)
+            for asset in self.assets
+        ])
+        price_ret = vectorized.price_returns(self.prices.to_numpy(dtype=float))
+        costs = self._cost_vector()
+
+        # Standalone per-asset results, then the weighted portfolio
+        assets = vectorized.backtest_signals(price_ret, signals, costs)
+        weights = self._weights(price_ret)
+        weighted = vectorized.backtest_signals(price_ret, signals, costs, weights)
+
+        portfolio = vectorized.combine_weighted(weighted)
+
+        self.weights = pd.DataFrame(weights, index=self.prices.index, columns=self.assets)
+        self.positions = pd.DataFrame(weighted['positions'], index=self.prices.index, columns=self.assets)
+        self.pnls_df = pd.DataFrame(weighted['pnl'], index=self.prices.index, columns=self.assets)
+        self.data = pd.DataFrame(portfolio, index=self.prices.index)
+
+        self.metrics = compute_metrics(self.prices.index, portfolio['net_positions'], portfolio['pnl'],
+                                       portfolio['cum_pnl'], portfolio['drawdown'], self.annualized_factor)
+        self.asset_metrics = self._asset_metrics(assets)
+
+    def _asset_metrics(self, result: dict[str, np.ndarray]) -> pd.DataFrame:
+        """Calculate per-asset statistics for all columns at once."""
+        return pd.DataFrame(metrics.column_metrics(result, self.annualized_factor), index=pd.Index(self.assets, name='asset'))
+
+    @property
+    def sharpe(self) -> float:
+        return self.metrics.sharpe
+
+    @property
+    def calmar(self) -> float:
+        return self.metrics.calmar
\ No newline at end of file
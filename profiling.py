@@ -0,0 +1,92 @@
+import pandas as pd
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Callable
+
+# Shared no-op context returned when profiling is disabled
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """Collect wall time, CPU time and optionally peak memory for named stages.
+
+    Attach it to a BacktestEngine (`engine.profiler = Profiler()`) or pass it to `Optimizer.run`.
+    `callback` is called with every record as it is taken. Peak memory uses tracemalloc and is
+    only measured with `memory=True`, since tracing slows the measured code down.
+    """
+    def __init__(self, memory: bool = False, callback: Callable[[dict], None] | None = None):
+        self.memory = memory
+        self.callback = callback
+        self.records = []
+
+    @contextmanager
+    def stage(self, name: str, **context):
+        # Trace only for the duration of the stage unless the caller is already tracing
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.memory:
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                'wall_s': time.perf_counter() - wall_start,
+                'cpu_s': time.process_time() - cpu_start,
+                'peak_mb': tracemalloc.get_traced_memory()[1] / 1024 ** 2 if self.memory else None,
+                'pid': os.getpid(),
+                **context,
+            }
+            if started_tracing:
+                tracemalloc.stop()
+            self.add(record)
+
+    def add(self, record: dict) -> None:
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def extend(self, records: list[dict]) -> None:
+        """Merge records taken elsewhere, e.g. in worker processes."""
+        for record in records:
+            self.add(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.records)
+
+    def to_json(self, path: str | None = None) -> str:
+        text = json.dumps(self.records, default=str)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def summary(self) -> pd.DataFrame:
+        """Aggregate the records per stage."""
+        df = self.to_frame()
+        if df.empty:
+            return df
+        return df.groupby('stage', sort=False).agg(
+            calls=('wall_s', 'size'),
+            wall_s=('wall_s', 'sum'),
+            mean_wall_s=('wall_s', 'mean'),
+            cpu_s=('cpu_s', 'sum'),
+            peak_mb=('peak_mb', 'max'),
+        )
+
+    def clear(self) -> None:
+        self.records = []
+
+
+def profile_stage(profiler: Profiler | None, name: str, **context):
+    """Time a stage with `profiler`, or do nothing when it is None."""
+    if profiler is None:
+        return _DISABLED
+    return profiler.stage(name, **context)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import pandas as pd
+
+import base64
+import html
+import io
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable
+
+from . import plotting
+
+PAGE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body {{ font-family: sans-serif; margin: 2em; }} pre {{ font-size: 13px; }} img {{ max-width: 100%; }}
+table {{ border-collapse: collapse; }} td, th {{ padding: 4px 12px; text-align: right; border-bottom: 1px solid #ddd; }}</style>
+</head><body>
+{body}
+</body></html>'''
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.=-]+', '_', text).strip('_')
+
+def _payload(engine, days: int) -> dict:
+    """Collect everything a report needs, so workers receive plain frames instead of engines."""
+    if engine.metrics is None:
+        engine.run()
+    return {
+        'title': engine.strategy_name,
+        'label': plotting.pnl_label(engine),
+        'stats': engine.stats_text(),
+        'data': engine.data[['cum_pnl', 'drawdown']],
+        'rolling_sharpe': plotting.rolling_sharpe(engine, days),
+        'days': days,
+        'sharpe': engine.sharpe,
+        'calmar': engine.calmar,
+    }
+
+def _render(payload: dict, output_dir: str, name: str, formats: tuple[str, ...], dpi: int) -> dict[str, str]:
+    """Render one report with the object-oriented Figure API, which draws on the non-interactive Agg canvas."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 12))
+    plotting.draw_overview(fig, payload['data'], payload['rolling_sharpe'].dropna(), payload['title'],
+                           payload['label'], payload['days'])
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+
+    paths = {}
+    if 'png' in formats:
+        paths['png'] = os.path.join(output_dir, f'{name}.png')
+        with open(paths['png'], 'wb') as f:
+            f.write(buffer.getvalue())
+    if 'html' in formats:
+        paths['html'] = os.path.join(output_dir, f'{name}.html')
+        image = base64.b64encode(buffer.getvalue()).decode('ascii')
+        body = f'<pre>{html.escape(payload["stats"])}</pre>\n<img src="data:image/png;base64,{image}">'
+        with open(paths['html'], 'w') as f:
+            f.write(PAGE.format(title=html.escape(payload['title']), body=body))
+    return paths
+
+def _write_index(output_dir: str, reports: pd.DataFrame) -> str:
+    rows = ''.join(
+        f'<tr><td style="text-align:left"><a href="{os.path.basename(row.html)}">{html.escape(row.strategy)}</a></td>'
+        f'<td style="text-align:left">{html.escape(row.params)}</td><td>{row.Sharpe:.2f}</td><td>{row.Calmar:.2f}</td></tr>'
+        for row in reports.itertuples()
+    )
+    body = ('<table><tr><th>Strategy</th><th>Params</th><th>Sharpe</th><th>Calmar</th></tr>'
+            f'{rows}</table>')
+    path = os.path.join(output_dir, 'index.html')
+    with open(path, 'w') as f:
+        f.write(PAGE.format(title='Backtest reports', body=body))
+    return path
+
+def render_reports(engines: Iterable,
+                   output_dir: str,
+                   formats: tuple[str, ...] = ('png', 'html'),
+                   n_jobs: int = 1,
+                   executor: Executor | None = None,
+                   dpi: int = 100,
+                   days: int = 60) -> pd.DataFrame:
+    """Render the stats and PnL/drawdown/rolling Sharpe charts of many engines to files without showing them.
+
+    Engines that have not been run yet are run first. Charts are drawn in worker processes when
+    `n_jobs` != 1 (-1 for all cores) or an `executor` is given. HTML reports embed their chart
+    and are linked from an `index.html`. Returns one row per engine with its metrics and file paths.
+    """
+    unsupported = set(formats) - {'png', 'html'}
+    if unsupported:
+        raise ValueError(f'Unsupported report formats: {sorted(unsupported)}')
+    os.makedirs(output_dir, exist_ok=True)
+
+    engines = list(engines)
+    payloads = [_payload(engine, days) for engine in engines]
+    names = [f'{i:03d}_{_slug(f"{engine.strategy_name}_{engine.params_str}")}' for i, engine in enumerate(engines)]
+
+    if n_jobs == 1 and executor is None:
+        paths = [_render(payload, output_dir, name, tuple(formats), dpi) for payload, name in zip(payloads, names)]
+    else:
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count() if n_jobs is None or n_jobs < 1 else n_jobs)
+        try:
+            futures = [executor.submit(_render, payload, output_dir, name, tuple(formats), dpi)
+                       for payload, name in zip(payloads, names)]
+            paths = [future.result() for future in futures]
+        finally:
+            if owns_executor:
+                executor.shutdown()
+
+    reports = pd.DataFrame([{
+        'strategy': engine.strategy_name,
+        'params': engine.params_str,
+        'Sharpe': payload['sharpe'],
+        'Calmar': payload['calmar'],
+        **path,
+    } for engine, payload, path in zip(engines, payloads, paths)])
+    if 'html' in formats and len(reports):
+        _write_index(output_dir, reports)
+    return reports
\ No newline at end of file
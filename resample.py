@@ -0,0 +1,91 @@
+import pandas as pd
+
+import os
+
+from .kline_store import STORE_SUFFIX, is_fresh, read_klines, read_store, source_signature, write_store
+from .partitions import check_partitions, concat_frames, map_months, partition_months, partition_path
+from .timeframe import TimeFrame
+
+# Resampling rules of the timeframes derived from 1m bars, which are labelled by their open time
+RESAMPLE_RULES = {
+    '3m': '3min',
+    '5m': '5min',
+    '10m': '10min',
+    '15m': '15min',
+    '1h': '1h',
+    '4h': '4h',
+    '8h': '8h',
+    '1d': '1D',
+    '1w': 'W-MON',
+    '1mn': 'MS',
+}
+# Bars of these timeframes cross month boundaries, so they are built from the cached daily bars
+FROM_DAILY = ('1w', '1mn')
+# How every Binance kline column combines; other columns keep their last value
+AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'close_time': 'last',
+    'quote_asset_volume': 'sum',
+    'number_of_trades': 'sum',
+    'taker_buy_base_asset_volume': 'sum',
+    'taker_buy_quote_asset_volume': 'sum',
+}
+
+
+def aggregate_klines(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate finer klines into `interval` bars labelled by their open time, dropping empty bars."""
+    rule = RESAMPLE_RULES[TimeFrame.from_str(interval).value.time_frame_str]
+    bars = df.resample(rule, label='left', closed='left').agg({column: AGGREGATIONS.get(column, 'last') for column in df.columns})
+    # Intervals without a single source bar (exchange downtime) have no close
+    return bars[bars['close'].notna()] if 'close' in bars else bars.dropna(how='all')
+
+def derived_path(dir_path: str, asset: str, interval: str, month: pd.Timestamp) -> str:
+    return os.path.join(dir_path, f'{asset}_{interval}', f'{asset}_{interval}_{month.strftime("%Y-%m")}{STORE_SUFFIX}')
+
+def resample_month(dir_path: str,
+                   asset: str,
+                   interval: str,
+                   month: pd.Timestamp,
+                   columns: list[str] | None = None) -> pd.DataFrame:
+    """Get the `interval` bars of one month, aggregating its 1m partition only if it changed since the last call."""
+    csv_path = partition_path(dir_path, asset, month)
+    path = derived_path(dir_path, asset, interval, month)
+    if not is_fresh(csv_path, path):
+        bars = aggregate_klines(read_klines(csv_path), interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_store(bars.reset_index(), path, source_signature(csv_path))
+    return read_store(path, columns)
+
+def resample_klines(asset: str,
+                    interval: str,
+                    start: pd.Timestamp,
+                    end: pd.Timestamp,
+                    dir_path: str | None = None,
+                    columns: list[str] | None = None,
+                    max_workers: int | None = None) -> pd.DataFrame:
+    """Build `interval` klines for [start, end] from the monthly `{asset}_1m_{YYYY-MM}.csv` partitions.
+
+    Intraday and daily bars are aggregated per month, concurrently, and cached next to the
+    partitions; weekly and monthly bars are aggregated from the cached daily bars.
+    """
+    if dir_path is None:
+        dir_path = os.path.join(os.path.dirname(__file__), 'price_data', 'klines')
+    interval = TimeFrame.from_str(interval).value.time_frame_str
+    base = '1d' if interval in FROM_DAILY else interval
+
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    months = partition_months(start, end)
+    check_partitions(dir_path, asset, months)
+    next_month = months[-1] + pd.DateOffset(months=1)
+    if interval == '1w' and os.path.exists(partition_path(dir_path, asset, next_month)):
+        # Complete the last week with the days that fall into the next month
+        months.append(next_month)
+
+    bars = concat_frames(map_months(lambda month: resample_month(dir_path, asset, base, month, columns), months, max_workers))
+    if base != interval:
+        bars = aggregate_klines(bars, interval)
+    return bars[(bars.index >= start) & (bars.index <= end)]
\ No newline at end of file
@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+
+import hashlib
+import inspect
+import os
+import pickle
+import weakref
+import zlib
+from typing import Callable
+
+from .indicator_cache import fingerprint
+
+# Columns an engine needs to restore a run without recomputing it; drawdown is derived from cum_pnl
+ENGINE_ARRAYS = ('signal', 'positions', 'transaction_cost', 'pnl', 'cum_pnl')
+ENTRY_SUFFIX = '.res'
+
+
+class ResultCache:
+    """Content-addressed on-disk store of backtest results with LRU eviction by total size.
+
+    Every entry is a zlib-compressed pickle named by its key, holding the Sharpe and Calmar ratios,
+    the engine's BacktestMetrics when it came from an engine run, and the result arrays unless
+    `store_arrays` is off. A hit refreshes the file's modification time, which eviction uses as
+    the recency order, so several processes can share one cache directory.
+    """
+    def __init__(self,
+                 path: str | None = None,
+                 max_bytes: int = 1024 ** 3,
+                 store_arrays: bool = True,
+                 enabled: bool = False):
+        self.path = path or os.path.join(os.path.dirname(__file__), 'result_cache')
+        self.max_bytes = max_bytes
+        self.store_arrays = store_arrays
+        self.enabled = enabled
+        self._nbytes = None  # scanned from disk on first write
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f'{key}{ENTRY_SUFFIX}')
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """List (mtime, size, path) of every entry on disk."""
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(ENTRY_SUFFIX):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:  # evicted by another process
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, key: str, arrays: tuple[str, ...] = (), engine: bool = False) -> dict | None:
+        """Get an entry that has all of `arrays` (and BacktestMetrics when `engine`), or None."""
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                entry = pickle.loads(zlib.decompress(f.read()))
+            os.utime(self._entry_path(key))
+        except (FileNotFoundError, zlib.error, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+        if (engine and entry['metrics'] is None) or any(name not in entry['arrays'] for name in arrays):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, sharpe: float, calmar: float, metrics=None, arrays: dict[str, np.ndarray] | None = None) -> None:
+        entry = {
+            'sharpe': float(sharpe),
+            'calmar': float(calmar),
+            'metrics': metrics,
+            'arrays': {name: np.asarray(values) for name, values in (arrays or {}).items()} if self.store_arrays else {},
+        }
+        payload = zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        if len(payload) > self.max_bytes:
+            return
+
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        # Write then rename, so readers in other processes never see a partial entry
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+        if self._nbytes is None:
+            self._nbytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._nbytes += len(payload) - previous
+        if self._nbytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        self._nbytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._nbytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._nbytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Delete every entry on disk and reset the counters."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> dict:
+        entries = self._entries() if os.path.isdir(self.path) else []
+        return {
+            'enabled': self.enabled,
+            'path': self.path,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'nbytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+
+_cache = ResultCache()
+
+
+def enable_result_cache(path: str | None = None, max_bytes: int | None = None, store_arrays: bool | None = None) -> None:
+    """Turn on the on-disk cache of backtest results used by BacktestEngine.run and Optimizer.run."""
+    if path is not None:
+        _cache.path = path
+        _cache._nbytes = None
+    if max_bytes is not None:
+        _cache.max_bytes = max_bytes
+    if store_arrays is not None:
+        _cache.store_arrays = store_arrays
+    _cache.enabled = True
+
+def disable_result_cache() -> None:
+    """Turn off the result cache, keeping its entries on disk."""
+    _cache.enabled = False
+
+def clear_result_cache() -> None:
+    """Delete every cached result and reset the counters."""
+    _cache.clear()
+
+def result_cache_info() -> dict:
+    """Get the hit/miss counters and disk usage of the result cache."""
+    return _cache.info()
+
+def active_cache() -> ResultCache | None:
+    return _cache if _cache.enabled else None
+
+# id(alpha) -> (weakref to alpha, the columns it had when it was first keyed)
+_alpha_columns: dict[int, tuple[weakref.ref, list]] = {}
+
+def _forget_alpha(ref: weakref.ref, alpha_id: int) -> None:
+    if _alpha_columns.get(alpha_id, (None,))[0] is ref:
+        del _alpha_columns[alpha_id]
+
+def _keyed_alpha(alpha):
+    """Get the part of `alpha` a key hashes: the columns the frame had when it was first keyed.
+
+    Strategies often add their indicator and signal columns to the alpha frame they are given, which
+    would otherwise change the key of every later run on the same frame.
+    """
+    if not isinstance(alpha, pd.DataFrame):
+        return alpha
+    entry = _alpha_columns.get(id(alpha))
+    if entry is None or entry[0]() is not alpha:
+        ref = weakref.ref(alpha, lambda ref, alpha_id=id(alpha): _forget_alpha(ref, alpha_id))
+        entry = _alpha_columns[id(alpha)] = (ref, list(alpha.columns))
+    columns = [column for column in entry[1] if column in alpha.columns]
+    return alpha if len(columns) == len(alpha.columns) else alpha[columns]
+
+def _strategy_source(strategy_function: Callable) -> str:
+    """Get the strategy's source, falling back to its bytecode when the source is unavailable."""
+    try:
+        return inspect.getsource(strategy_function)
+    except (OSError, TypeError):
+        code = getattr(strategy_function, '__code__', None)
+        return repr(strategy_function) if code is None else repr((code.co_code, code.co_consts, code.co_names))
+
+def _param_repr(value) -> str:
+    # 14, 14.0 and np.float64(14) select the same backtest
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(float(value))
+    return repr(value)
+
+def base_key(data,
+             strategy_function: Callable,
+             alpha,
+             transaction_cost,
+             annualized_factor: int,
+             execution=None) -> str:
+    """Hash everything a backtest depends on except its params.
+
+    Only the price columns the backtest reads are hashed, so result columns added to `data` by an
+    earlier run do not change the key, and neither do columns a strategy adds to `alpha`. The
+    strategy's own source is hashed, not the helpers it calls.
+    """
+    columns = ['close'] if execution is None or not execution.uses_intrabar_prices else ['open', 'high', 'low', 'close']
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in (fingerprint(data[columns]), fingerprint(_keyed_alpha(alpha)),
+                 strategy_function.__module__, strategy_function.__qualname__, _strategy_source(strategy_function),
+                 repr(transaction_cost), annualized_factor, repr(execution)):
+        hasher.update(repr(part).encode())
+    return hasher.hexdigest()
+
+def result_key(base: str, params: dict) -> str:
+    """Combine a base key with one parameter combination."""
+    hasher = hashlib.blake2b(base.encode(), digest_size=16)
+    hasher.update(repr(sorted((name, _param_repr(value)) for name, value in params.items())).encode())
+    return hasher.hexdigest()
\ No newline at end of file
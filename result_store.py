@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+import heapq
+
+
+class ResultStore:
+    """Preallocated (bars x combinations) storage for the cumulative PnL curves of a sweep.
+
+    Curves can be kept as float32, spilled to a disk-backed memmap at `path`, thinned to every
+    `downsample`-th bar, or limited to the `top_n` combinations by score. Top-N ties are broken
+    by grid position, so the kept set does not depend on the order results arrive in.
+    """
+    def __init__(self,
+                 index: pd.Index,
+                 n_combinations: int,
+                 dtype: np.dtype | str = np.float64,
+                 path: str | None = None,
+                 downsample: int = 1,
+                 top_n: int | None = None):
+        self.index = index[::downsample]
+        self.downsample = downsample
+        self.top_n = top_n
+        n_slots = n_combinations if top_n is None else min(top_n, n_combinations)
+
+        shape = (len(self.index), n_slots)
+        if path is None:
+            self.values = np.full(shape, np.nan, dtype=dtype)
+        else:
+            self.values = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+            self.values[:] = np.nan
+
+        self.keys = [None] * n_slots
+        self.positions = np.full(n_slots, -1)
+        self._n_used = 0
+        self._heap = []  # (score, -position, slot) with the worst kept combination on top
+
+    def add(self, position: int, key: tuple, cum_pnl: np.ndarray, score: float = np.nan) -> None:
+        """Store the curve of the combination at grid `position` if it has a slot."""
+        if self.top_n is None:
+            slot = position
+        else:
+            rank = (-np.inf if np.isnan(score) else score, -position)
+            if self._n_used < len(self.keys):
+                slot = self._n_used
+                self._n_used += 1
+                heapq.heappush(self._heap, (*rank, slot))
+            elif rank > self._heap[0][:2]:
+                slot = heapq.heapreplace(self._heap, (*rank, self._heap[0][2]))[2]
+            else:
+                return
+
+        self.values[:, slot] = cum_pnl[::self.downsample]
+        self.keys[slot] = key
+        self.positions[slot] = position
+
+    def add_batch(self, start: int, keys: list[tuple], cum_pnl: np.ndarray, scores: np.ndarray) -> None:
+        """Store a (bars x chunk) block of curves whose first column is grid position `start`."""
+        if self.top_n is None:
+            self.values[:, start:start + len(keys)] = cum_pnl[::self.downsample]
+            self.keys[start:start + len(keys)] = keys
+            self.positions[start:start + len(keys)] = np.arange(start, start + len(keys))
+            return
+        for j, key in enumerate(keys):
+            self.add(start + j, key, cum_pnl[:, j], scores[j])
+
+    def to_frame(self, names: list[str] | None = None) -> pd.DataFrame:
+        """Get the stored curves in grid order, one column per parameter combination."""
+        slots = [slot for slot in np.argsort(self.positions, kind='stable') if self.positions[slot] >= 0]
+        values = self.values if slots == list(range(len(self.keys))) else self.values[:, slots]
+        columns = pd.MultiIndex.from_tuples([self.keys[slot] for slot in slots], names=names) if slots else None
+        return pd.DataFrame(values, index=self.index, columns=columns, copy=False)
\ No newline at end of file
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from .timeframe import TimeFrame
+
+ROLLING_METRICS = ('Sharpe', 'Annual Return', 'Volatility', 'Max Drawdown', 'Calmar')
+DEFAULT_DAYS = (30, 60, 180, 365)
+
+
+def window_bars(days: int, annualized_factor: int) -> int:
+    """Convert a window in days into bars of a timeframe with `annualized_factor` bars per year."""
+    return int(days * annualized_factor / 365)
+
+def _window_diff(cumsum: np.ndarray, window: int) -> np.ndarray:
+    """Sum the `window` values ending at each bar from a cumulative sum with a leading zero row."""
+    return cumsum[window:] - cumsum[:-window]
+
+def rolling_max_drawdown(cum_pnl: np.ndarray, window: int) -> np.ndarray:
+    """Maximum drawdown of every trailing `window` along axis 0 in O(n), for windows ending at bars window-1..n-1.
+
+    The series is cut into blocks of `window` bars (van Herk/Gil-Werman). A window that crosses a
+    block boundary splits into a suffix of one block and a prefix of the next, and its drawdown is
+    the worst of the suffix's, the prefix's, and the prefix minimum below the suffix maximum. All
+    of these are running extremes within a block, computed with ufunc accumulations.
+    """
+    n = len(cum_pnl)
+    n_blocks = -(-n // window)
+    padding = [(0, n_blocks * window - n)] + [(0, 0)] * (cum_pnl.ndim - 1)
+    blocks = np.pad(cum_pnl, padding, mode='edge').reshape((n_blocks, window) + cum_pnl.shape[1:])
+
+    prefix_max = np.maximum.accumulate(blocks, axis=1)
+    prefix_min = np.minimum.accumulate(blocks, axis=1)
+    prefix_drawdown = np.minimum.accumulate(blocks - prefix_max, axis=1)
+    reverse = blocks[:, ::-1]
+    suffix_max = np.maximum.accumulate(reverse, axis=1)[:, ::-1]
+    suffix_min = np.minimum.accumulate(reverse, axis=1)
+    suffix_drawdown = np.minimum.accumulate(suffix_min - reverse, axis=1)[:, ::-1]
+
+    flat = lambda values: values.reshape((n_blocks * window,) + cum_pnl.shape[1:])
+    prefix_max, prefix_min, prefix_drawdown = flat(prefix_max), flat(prefix_min), flat(prefix_drawdown)
+    suffix_max, suffix_drawdown = flat(suffix_max), flat(suffix_drawdown)
+
+    end = np.arange(window - 1, n)
+    start = end - window + 1
+    crossing = np.minimum(np.minimum(suffix_drawdown[start], prefix_drawdown[end]), prefix_min[end] - suffix_max[start])
+    aligned = (start % window == 0).reshape((-1,) + (1,) * (cum_pnl.ndim - 1))
+    return np.where(aligned, prefix_drawdown[end], crossing)
+
+def rolling_metrics(pnl: np.ndarray,
+                    windows: list[int],
+                    annualized_factor: int,
+                    names: tuple[str, ...] = ROLLING_METRICS) -> dict[tuple[str, int], np.ndarray]:
+    """Calculate rolling metrics of a (bars,) or (bars x strategies) pnl array for several windows in bars.
+
+    Means and variances come from cumulative sums computed once for all windows and maximum
+    drawdowns from `rolling_max_drawdown`, so each window costs O(n). As with `rolling(window)`,
+    the first window-1 bars and windows containing a NaN are NaN. Windows with a constant pnl
+    have no Sharpe.
+    """
+    unsupported = set(names) - set(ROLLING_METRICS)
+    if unsupported:
+        raise ValueError(f'Unsupported rolling metrics: {sorted(unsupported)}')
+    pnl = np.asarray(pnl, dtype=float)
+    n = len(pnl)
+    valid = ~np.isnan(pnl)
+    values = np.where(valid, pnl, 0.0)
+
+    # Centering on the overall mean keeps the windowed variance from cancelling out in long series
+    center = values.sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+    centered = np.where(valid, values - center, 0.0)
+    zero_row = np.zeros((1,) + pnl.shape[1:])
+    count = np.concatenate([zero_row, np.cumsum(valid, axis=0)])
+    sum_1 = np.concatenate([zero_row, np.cumsum(centered, axis=0)])
+    sum_2 = np.concatenate([zero_row, np.cumsum(centered ** 2, axis=0)])
+    changes = np.concatenate([zero_row, np.cumsum(values[1:] != values[:-1], axis=0)])
+    cum_pnl = np.cumsum(values, axis=0)
+
+    results = {}
+    for window in windows:
+        output = {name: np.full(pnl.shape, np.nan) for name in names}
+        if 1 <= window <= n:
+            full = _window_diff(count, window) == window
+            window_sum = _window_diff(sum_1, window)
+            mean = window_sum / window + center
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variance = np.maximum(_window_diff(sum_2, window) - window_sum ** 2 / window, 0) / (window - 1)
+                # Exactly flat windows (no position) would otherwise keep a rounding-error variance
+                constant = (changes[window - 1:] - changes[:n - window + 1]) == 0
+                std = np.where(constant, 0.0, np.sqrt(variance))
+                annual_return = mean * annualized_factor
+                computed = {
+                    'Sharpe': np.where(std == 0, np.nan, mean / std * np.sqrt(annualized_factor)),
+                    'Annual Return': annual_return,
+                    'Volatility': std * np.sqrt(annualized_factor),
+                }
+                if 'Max Drawdown' in names or 'Calmar' in names:
+                    max_drawdown = rolling_max_drawdown(cum_pnl, window)
+                    computed['Max Drawdown'] = max_drawdown
+                    computed['Calmar'] = np.where(max_drawdown == 0, np.nan, annual_return / np.abs(max_drawdown))
+            for name in names:
+                output[name][window - 1:] = np.where(full, computed[name], np.nan)
+        for name in names:
+            results[name, window] = output[name]
+    return results
+
+def rolling_metrics_frame(pnl: pd.Series | pd.DataFrame,
+                          days: tuple[int, ...] = DEFAULT_DAYS,
+                          annualized_factor: int | None = None,
+                          names: tuple[str, ...] = ROLLING_METRICS) -> pd.DataFrame:
+    """Rolling metrics of a pnl series or (bars x strategies) frame over windows given in days.
+
+    Columns are (metric, days), followed by the strategy (or parameter) levels for a frame. Every
+    requested `days` value gets its columns, even when several round to the same number of bars.
+    """
+    if annualized_factor is None:
+        annualized_factor = TimeFrame.from_data(pnl).value.annualized_factor
+    days = list(dict.fromkeys(int(d) for d in days))
+    bars = [window_bars(d, annualized_factor) for d in days]
+    results = rolling_metrics(pnl.to_numpy(dtype=float), list(dict.fromkeys(bars)), annualized_factor, names)
+
+    # Levels keep the requested order and the codes stay sorted, so (metric, days) lookups are fast
+    levels = [list(names), days]
+    codes = [np.repeat(np.arange(len(names)), len(days)), np.tile(np.arange(len(days)), len(names))]
+    if isinstance(pnl, pd.Series):
+        columns = pd.MultiIndex(levels=levels, codes=codes, names=['metric', 'days'])
+        values = np.column_stack([results[name, window] for name in names for window in bars])
+    else:
+        # Parameter levels of an optimizer's pnl frame are kept as separate levels
+        strategies = pnl.columns if isinstance(pnl.columns, pd.MultiIndex) else pd.MultiIndex.from_arrays([pnl.columns])
+        columns = pd.MultiIndex(levels=levels + list(strategies.levels),
+                                codes=[np.repeat(code, len(strategies)) for code in codes]
+                                      + [np.tile(code, len(codes[0])) for code in strategies.codes],
+                                names=['metric', 'days'] + [name or 'strategy' for name in strategies.names])
+        values = np.concatenate([results[name, window] for name in names for window in bars], axis=1)
+    return pd.DataFrame(values, index=pnl.index, columns=columns)
\ No newline at end of file
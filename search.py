@@ -0,0 +1,173 @@
+import numpy as np
+
+from dataclasses import dataclass
+from math import ceil, log
+from typing import Callable
+
+# evaluate(rows, n_bars=None) -> {'Sharpe': array, 'Calmar': array} for the given rows of the grid,
+# backtested on the first n_bars bars (all bars when None, which records the results)
+Evaluate = Callable[..., dict[str, np.ndarray]]
+
+
+def _scores(values: np.ndarray) -> np.ndarray:
+    """Treat NaN metrics as the worst possible score."""
+    return np.where(np.isnan(values), -np.inf, values)
+
+def _unit_coordinates(param_grid: np.ndarray) -> np.ndarray:
+    """Map every parameter to [0, 1] by the rank of its value among the grid values."""
+    coordinates = np.zeros(param_grid.shape)
+    for i in range(param_grid.shape[1]):
+        values, inverse = np.unique(param_grid[:, i], return_inverse=True)
+        if len(values) > 1:
+            coordinates[:, i] = inverse / (len(values) - 1)
+    return coordinates
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    # Abramowitz & Stegun 7.1.26 erf approximation (absolute error < 1.5e-7)
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+@dataclass(frozen=True)
+class RandomSearch:
+    """Backtest `n_iter` combinations drawn uniformly from the grid without replacement."""
+    n_iter: int = 50
+    seed: int | None = None
+
+    def max_evaluations(self, n_combinations: int) -> int:
+        return min(self.n_iter, n_combinations)
+
+    def search(self, param_grid: np.ndarray, evaluate: Evaluate, n_bars: int) -> None:
+        rng = np.random.default_rng(self.seed)
+        rows = rng.choice(len(param_grid), self.max_evaluations(len(param_grid)), replace=False)
+        evaluate(np.sort(rows))
+
+
+@dataclass(frozen=True)
+class SuccessiveHalving:
+    """Score candidates on growing prefixes of the data and keep the best 1/`eta` after each round.
+
+    The first round uses `min_fraction` of the bars and every round multiplies it by `eta` until
+    the survivors run on the full history, which is the only round that is recorded. `n_candidates`
+    draws a random subset of the grid to start from (all combinations when None).
+    """
+    n_candidates: int | None = None
+    eta: int = 3
+    min_fraction: float = 1 / 9
+    metric: str = 'Sharpe'
+    seed: int | None = None
+
+    def _schedule(self, n_combinations: int) -> list[tuple[int, float]]:
+        """Get the (candidates, fraction of bars) of every round."""
+        n = n_combinations if self.n_candidates is None else min(self.n_candidates, n_combinations)
+        n_rounds = max(1, ceil(log(1 / self.min_fraction, self.eta) - 1e-9) + 1)
+        schedule = []
+        for k in range(n_rounds):
+            schedule.append((n, min(1.0, self.min_fraction * self.eta ** k)))
+            n = max(1, n // self.eta)
+        schedule[-1] = (schedule[-1][0], 1.0)
+        return schedule
+
+    def max_evaluations(self, n_combinations: int) -> int:
+        return self._schedule(n_combinations)[-1][0]
+
+    def search(self, param_grid: np.ndarray, evaluate: Evaluate, n_bars: int) -> None:
+        schedule = self._schedule(len(param_grid))
+        rng = np.random.default_rng(self.seed)
+        rows = np.sort(rng.choice(len(param_grid), schedule[0][0], replace=False))
+
+        for k, (n_keep, fraction) in enumerate(schedule):
+            if k > 0:
+                # Ties are broken by grid order so the survivors are deterministic
+                order = np.lexsort((rows, -scores))
+                rows = np.sort(rows[order[:n_keep]])
+            if fraction >= 1:
+                evaluate(rows)
+                return
+            scores = _scores(evaluate(rows, max(2, int(n_bars * fraction)))[self.metric])
+
+
+@dataclass(frozen=True)
+class BayesianSearch:
+    """Sample combinations by expected improvement under a Gaussian process surrogate.
+
+    Parameters are placed on a unit grid by the rank of their values. After `n_initial` random
+    combinations, each step fits a GP with an RBF kernel (length scale chosen by marginal
+    likelihood) to the standardized scores and backtests the `batch_size` unevaluated combinations
+    with the highest expected improvement, until `n_iter` combinations have been evaluated.
+    """
+    n_iter: int = 50
+    n_initial: int = 10
+    batch_size: int = 1
+    metric: str = 'Sharpe'
+    xi: float = 0.01
+    noise: float = 1e-6
+    length_scales: tuple[float, ...] = (0.05, 0.1, 0.2, 0.4, 0.8)
+    seed: int | None = None
+
+    def max_evaluations(self, n_combinations: int) -> int:
+        return min(self.n_iter, n_combinations)
+
+    def search(self, param_grid: np.ndarray, evaluate: Evaluate, n_bars: int) -> None:
+        n_total = self.max_evaluations(len(param_grid))
+        rng = np.random.default_rng(self.seed)
+        x = _unit_coordinates(param_grid)
+
+        rows = np.sort(rng.choice(len(param_grid), min(self.n_initial, n_total), replace=False))
+        scores = _scores(evaluate(rows)[self.metric])
+        evaluated = np.zeros(len(param_grid), dtype=bool)
+        evaluated[rows] = True
+
+        while len(rows) < n_total:
+            candidates = np.flatnonzero(~evaluated)
+            ei = self._expected_improvement(x[rows], scores, x[candidates])
+            # Ties (e.g. a flat surrogate) are broken at random
+            order = np.lexsort((rng.random(len(candidates)), -ei))
+            new_rows = np.sort(candidates[order[:min(self.batch_size, n_total - len(rows))]])
+
+            rows = np.concatenate([rows, new_rows])
+            scores = np.concatenate([scores, _scores(evaluate(new_rows)[self.metric])])
+            evaluated[new_rows] = True
+
+    def _expected_improvement(self, x_obs: np.ndarray, y_obs: np.ndarray, x_new: np.ndarray) -> np.ndarray:
+        finite = np.isfinite(y_obs)
+        if finite.sum() < 2:
+            return np.zeros(len(x_new))
+        # Combinations without a finite score are pinned just below the worst observed one
+        y = np.where(finite, y_obs, y_obs[finite].min() - y_obs[finite].std())
+        std = y.std()
+        y = (y - y.mean()) / (std if std > 0 else 1)
+
+        sq_dist_obs = ((x_obs[:, None, :] - x_obs[None, :, :]) ** 2).sum(axis=-1)
+        best = None
+        for length_scale in self.length_scales:
+            k = np.exp(-0.5 * sq_dist_obs / length_scale ** 2) + self.noise * np.eye(len(x_obs))
+            try:
+                chol = np.linalg.cholesky(k)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, y))
+            log_likelihood = -0.5 * y @ alpha - np.log(np.diag(chol)).sum()
+            if best is None or log_likelihood > best[0]:
+                best = (log_likelihood, length_scale, chol, alpha)
+        if best is None:
+            return np.zeros(len(x_new))
+        _, length_scale, chol, alpha = best
+
+        # Expanded form avoids a (candidates x observations x parameters) intermediate on large grids
+        sq_dist_new = np.maximum((x_new ** 2).sum(axis=1)[:, None] + (x_obs ** 2).sum(axis=1)[None, :]
+                                 - 2 * x_new @ x_obs.T, 0)
+        k_new = np.exp(-0.5 * sq_dist_new / length_scale ** 2)
+        mean = k_new @ alpha
+        v = np.linalg.solve(chol, k_new.T)
+        sigma = np.sqrt(np.maximum(1 - (v * v).sum(axis=0), 1e-12))
+
+        improvement = mean - y.max() - self.xi
+        z = improvement / sigma
+        return improvement * _norm_cdf(z) + sigma * _norm_pdf(z)
\ No newline at end of file
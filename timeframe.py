@@ -22,4 +22,48 @@ class TimeFrame(Enum):
     M3 = TimeframeInfo('3m', pd.Timedelta(minutes=3), 365 * 24 * 20)
     M1 = TimeframeInfo('1m', pd.Timedelta(minutes=1), 365 * 24 * 60)
     W1 = TimeframeInfo('1w', pd.DateOffset(weeks=1), 52)
-    MN1 = TimeframeInfo('1mn', pd.DateOffset(months=1), 12)
\ No newline at end of file
+    MN1 = TimeframeInfo('1mn', pd.DateOffset(months=1), 12)
+    
+    @classmethod
+    def from_time_delta(cls, time_delta: pd.Timedelta) -> 'TimeFrame':
+        for timeframe in cls:
+            if time_delta == timeframe.value.time_delta:
+                return timeframe
+        
+        raise ValueError(f'Unsupported timeframe: {time_delta}')
+    
+    @classmethod
+    def from_str(cls, time_frame_str: str) -> 'TimeFrame':
+        for timeframe in cls:
+            if time_frame_str.lower() == timeframe.value.time_frame_str:
+                return timeframe
+        
+        raise ValueError(f'Unsupported timeframe: {time_frame_str}')
+    
+    @classmethod
+    def from_spacing(cls, spacing: pd.Timedelta) -> 'TimeFrame | None':
+        """Get the timeframe whose bars are `spacing` apart, or None if no timeframe fits."""
+        if spacing == pd.Timedelta(weeks=1):
+            return cls.W1
+        if pd.Timedelta(days=28) <= spacing <= pd.Timedelta(days=31):
+            return cls.MN1
+        for timeframe in cls:
+            if isinstance(timeframe.value.time_delta, pd.Timedelta) and spacing == timeframe.value.time_delta:
+                return timeframe
+        return None
+    
+    @classmethod
+    def from_data(cls, data: pd.DataFrame | pd.Series) -> 'TimeFrame':
+        """Get the timeframe of `data` from the median spacing of its index.
+        
+        `data.attrs['timeframe']` (set by fetch_price) is only used when the index cannot decide,
+        since pandas carries attrs through resample, iloc and asfreq and they may be stale.
+        """
+        recorded = cls.from_str(data.attrs['timeframe']) if 'timeframe' in data.attrs else None
+        if len(data.index) > 1:
+            inferred = cls.from_spacing(pd.Series(data.index).diff().median())
+            if inferred is not None:
+                return inferred
+        if recorded is not None:
+            return recorded
+        return cls.from_time_delta(data.index[1] - data.index[0])
\ No newline at end of file
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+
+def align_signal(signal, index: pd.Index) -> np.ndarray:
+    """Convert a strategy output into a float array aligned to the price index."""
+    if isinstance(signal, pd.DataFrame):
+        signal = signal.squeeze(axis=1)
+    if isinstance(signal, pd.Series):
+        # Same label alignment as assigning a Series to a DataFrame column
+        return signal.reindex(index).to_numpy(dtype=float)
+
+    signal = np.asarray(signal, dtype=float)
+    if len(signal) != len(index):
+        raise ValueError(f'Signal length {len(signal)} does not match price data length {len(index)}.')
+    return signal
+
+def price_returns(close: np.ndarray) -> np.ndarray:
+    """Calculate simple returns, matching `pd.Series.pct_change()`."""
+    close = np.asarray(close, dtype=float)
+    price_ret = np.full(close.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_ret[1:] = close[1:] / close[:-1] - 1
+    return price_ret
+
+def positions_from_signals(signals: np.ndarray) -> np.ndarray:
+    """Shift signals by one bar and fill the gaps with flat positions."""
+    positions = np.zeros(signals.shape)
+    positions[1:] = signals[:-1]
+    positions[np.isnan(positions)] = 0
+    return positions
+
+def nan_cumsum(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum along axis 0 that skips NaN like `pd.Series.cumsum()`."""
+    is_nan = np.isnan(values)
+    cum_values = np.cumsum(np.where(is_nan, 0, values), axis=0)
+    cum_values[is_nan] = np.nan
+    return cum_values
+
+def pnl_from_cum_pnl(cum_pnl: np.ndarray) -> np.ndarray:
+    """Recover per-bar pnl from a cumulative pnl array produced by `nan_cumsum`."""
+    filled = pd.DataFrame(cum_pnl).ffill().fillna(0).to_numpy().reshape(cum_pnl.shape)
+    pnl = np.diff(filled, axis=0, prepend=np.zeros((1,) + cum_pnl.shape[1:]))
+    pnl[np.isnan(cum_pnl)] = np.nan
+    return pnl
+
+def drawdown(cum_pnl: np.ndarray) -> np.ndarray:
+    """Calculate the drawdown from the running peak along axis 0."""
+    return cum_pnl - np.fmax.accumulate(cum_pnl, axis=0)
+
+def backtest_signals(price_ret: np.ndarray,
+                     signals: np.ndarray,
+                     transaction_cost: float | np.ndarray = 0,
+                     weights: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """Run the BacktestEngine pipeline on a (bars,) or (bars x columns) signal array.
+
+    `transaction_cost` may hold one cost per column and `weights` scales the shifted positions.
+    """
+    signals = np.asarray(signals, dtype=float)
+    if signals.ndim == 2 and price_ret.ndim == 1:
+        price_ret = price_ret[:, None]
+
+    positions = positions_from_signals(signals)
+    if weights is not None:
+        positions = positions * weights
+    costs = np.full(positions.shape, np.nan)
+    costs[1:] = np.abs(np.diff(positions, axis=0)) * transaction_cost
+    pnl = price_ret * positions - costs
+    cum_pnl = nan_cumsum(pnl)
+
+    return {
+        'signal': signals,
+        'positions': positions,
+        'transaction_cost': costs,
+        'pnl': pnl,
+        'cum_pnl': cum_pnl,
+        'drawdown': drawdown(cum_pnl),
+    }
+
+def inverse_volatility_weights(returns: np.ndarray, vol_window: int) -> np.ndarray:
+    """Weight (bars x columns) returns by inverse trailing volatility known at the close of the previous bar.
+
+    Weights are normalized across columns; bars where no column has a volatility yet are equal weighted.
+    """
+    n_columns = returns.shape[1]
+    vol = pd.DataFrame(returns).rolling(vol_window).std().shift(1).to_numpy()
+    with np.errstate(divide='ignore'):
+        inverse_vol = np.where(vol > 0, 1 / vol, 0)
+    total = inverse_vol.sum(axis=1, keepdims=True)
+    return np.where(total > 0, inverse_vol / np.where(total > 0, total, 1), 1 / n_columns)
+
+def combine_weighted(weighted: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Sum the weighted columns of a `backtest_signals` result into one portfolio.
+
+    A bar's pnl is NaN only when every column's is.
+    """
+    all_nan = np.isnan(weighted['pnl']).all(axis=1)
+    pnl = np.where(all_nan, np.nan, np.nansum(weighted['pnl'], axis=1))
+    cum_pnl = nan_cumsum(pnl)
+    return {
+        'gross_exposure': np.abs(weighted['positions']).sum(axis=1),
+        'net_positions': weighted['positions'].sum(axis=1),
+        'pnl': pnl,
+        'cum_pnl': cum_pnl,
+        'drawdown': drawdown(cum_pnl),
+    }
\ No newline at end of file